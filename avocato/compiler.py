@@ -0,0 +1,1136 @@
+"""Code generation for :class:`~avocato.objects.AvocatoObject` schemas.
+
+Instead of walking ``_fields`` on every call, :class:`~avocato.objects.AvocatoObjectMeta` asks this
+module to write straight-line functions specialised for a schema: one unrolled block per field,
+with keys, defaults and helpers bound as closure constants. The generated source is registered with
+:mod:`linecache`, so tracebacks and debuggers show real lines.
+"""
+import contextlib
+import inspect
+import itertools
+import json
+import keyword
+import linecache
+import operator
+import threading
+import types
+from collections.abc import Mapping
+
+from .exceptions import AvocatoValidationError
+from .fields import DateTimeField, DecimalField, Field, ListField
+from .validators import Length, OneOf, OneOfType, Required
+
+
+_counter = itertools.count()
+# Lists collecting the filenames of the functions built inside ``collect_sources`` blocks.
+_collecting = threading.local()
+
+
+@contextlib.contextmanager
+def collect_sources():
+    """Yields a list that collects the :mod:`linecache` filenames of the functions built in the
+    block (in the current thread), so they can be released with :func:`release_sources`.
+    """
+    stack = getattr(_collecting, "stack", None)
+    if stack is None:
+        stack = _collecting.stack = []
+    filenames = []
+    stack.append(filenames)
+    try:
+        yield filenames
+    finally:
+        stack.pop()
+
+
+def release_sources(filenames):
+    """Removes the generated source of the functions built under ``filenames`` from
+    :mod:`linecache`, once the functions are no longer used.
+    """
+    for filename in filenames:
+        linecache.cache.pop(filename, None)
+
+
+class FunctionBuilder(object):
+    """Collects the source lines and closure constants of a single generated function.
+    """
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.lines = []
+        self.constants = {}
+        self._bound = {}
+
+    def bind(self, value, prefix="c"):
+        """Makes ``value`` available to the generated function and returns its local name.
+        """
+        key = (prefix, id(value))
+        try:
+            return self._bound[key]
+        except KeyError:
+            pass
+        name = "{0}{1}".format(prefix, len(self.constants))
+        self.constants[name] = value
+        self._bound[key] = name
+        return name
+
+    def define(self, name, value):
+        """Makes ``value`` available to the generated function under a fixed ``name``.
+        """
+        self.constants[name] = value
+
+    def emit(self, indent, line):
+        self.lines.append("    " * (indent + 1) + line)
+
+    def build(self, owner=""):
+        constants = sorted(self.constants)
+        source = "def __make__({0}):\n    def {1}({2}):\n{3}\n    return {1}\n".format(
+            ", ".join(constants),
+            self.name,
+            ", ".join(self.args),
+            "\n".join("    " + line for line in self.lines or ["    pass"]),
+        )
+        filename = "<avocato {0} {1}#{2}>".format(owner, self.name, next(_counter))
+        namespace = {}
+        exec(compile(source, filename, "exec"), namespace)
+        linecache.cache[filename] = (
+            len(source),
+            None,
+            source.splitlines(True),
+            filename,
+        )
+        for filenames in getattr(_collecting, "stack", ()):
+            filenames.append(filename)
+        return namespace["__make__"](**self.constants)
+
+
+def is_attribute_name(name):
+    """Whether ``name`` can be written as ``obj.<name>`` in generated source.
+    """
+    return name.isidentifier() and not keyword.iskeyword(name)
+
+
+def attribute(target, name):
+    if is_attribute_name(name):
+        return "{0}.{1}".format(target, name)
+    return "getattr({0}, {1!r})".format(target, name)
+
+
+def assign_attribute(target, name, value):
+    if is_attribute_name(name):
+        return "{0}.{1} = {2}".format(target, name, value)
+    return "setattr({0}, {1!r}, {2})".format(target, name, value)
+
+
+def unique_fields(fields):
+    """Drops fields that are shadowed by an earlier field with the same name.
+    """
+    seen = set()
+    result = []
+    for field in fields:
+        if field.name not in seen:
+            seen.add(field.name)
+            result.append(field)
+    return result
+
+
+def default_expression(fb, field):
+    """Returns an expression producing the default value of ``field``.
+
+    Defaults passed to the constructor are inlined as constants. Fields that override the
+    :attr:`Field.default` property (e.g. to hand out a fresh mutable object) are asked every time.
+    """
+    if type(field).default is Field.default:
+        if field._default is None:
+            return "None"
+        return fb.bind(field._default, "d")
+    return "{0}.default".format(fb.bind(field, "f"))
+
+
+def emit_lookup(fb, field, indent, source="data", value="value"):
+    """Emits code that assigns the raw input value of ``field`` to ``value``.
+
+    Fields read with the default item getter index ``source`` with their key directly, custom
+    getters are called. Either way a missing key is treated as a missing value.
+    """
+    fb.emit(indent, "try:")
+    if field._key is not None:
+        fb.emit(indent + 1, "{0} = {1}[{2!r}]".format(value, source, field._key))
+    else:
+        fb.emit(indent + 1, "{0} = {1}({2})".format(value, fb.bind(field._getter, "g"), source))
+    fb.emit(indent, "except KeyError:")
+    fb.emit(indent + 1, "{0} = None".format(value))
+
+
+def nested_schema(field):
+    """Returns the :class:`~avocato.objects.AvocatoObject` class of a nested ``field`` or None.
+    """
+    schema = type(field)
+    return schema if hasattr(schema, "_meta_model") else None
+
+
+def item_validators(field):
+    """Returns the element validators of a ``ListField(of=...)`` or None for other fields.
+    """
+    return field.item_validators if isinstance(field, ListField) else None
+
+
+def has_nested_errors(field):
+    """Whether errors of ``field`` can be a dict of nested errors instead of a list of messages.
+    """
+    return nested_schema(field) is not None or item_validators(field) is not None
+
+
+def local(name, depth):
+    """Returns the name of a local variable used for a schema nested ``depth`` levels deep.
+    """
+    return "{0}{1}".format(name, depth) if depth else name
+
+
+def emit_populate(fb, fields, indent, instance, data, fresh, depth=0):
+    """Emits code that fills ``instance`` with the values of ``fields`` from the mapping ``data``.
+    """
+    value = local("value", depth)
+    fb.emit(indent, "if {0}:".format(data))
+    if not fields:
+        fb.emit(indent + 1, "pass")
+    for field in fields:
+        emit_lookup(fb, field, indent + 1, source=data, value=value)
+        fb.emit(indent + 1, "if {0} is None:".format(value))
+        inner = indent + 2
+        if not fresh:
+            fb.emit(inner, "{0} = getattr({1}, {2!r}, None)".format(value, instance, field.name))
+            fb.emit(inner, "if {0} is None:".format(value))
+            inner += 1
+        fb.emit(inner, "{0} = {1}".format(value, default_expression(fb, field)))
+        emit_convert(fb, field, indent + 1, value, depth)
+        fb.emit(indent + 1, assign_attribute(instance, field.name, value))
+
+    fb.emit(indent, "else:")
+    if not fields:
+        fb.emit(indent + 1, "pass")
+    for field in fields:
+        default = default_expression(fb, field)
+        if fresh:
+            fb.emit(indent + 1, assign_attribute(instance, field.name, default))
+            continue
+        fb.emit(indent + 1, "{0} = getattr({1}, {2!r}, None)".format(value, instance, field.name))
+        fb.emit(indent + 1, "if {0} is None:".format(value))
+        fb.emit(indent + 2, "{0} = {1}".format(value, default))
+        fb.emit(indent + 1, assign_attribute(instance, field.name, value))
+
+
+def emit_convert(fb, field, indent, value, depth):
+    """Emits the ``else:`` branch of an ``if value is None:`` check that converts a given
+    ``value`` of ``field``, if the field needs that.
+
+    Mappings of nested fields are loaded and lists of a ``ListField`` with ``storage`` are
+    converted to arrays.
+    """
+    if nested_schema(field) is not None:
+        fb.emit(indent, "else:")
+        emit_nested_load(fb, field, indent + 1, value, depth + 1)
+    elif getattr(field, "storage", None) is not None:
+        fb.emit(indent, "else:")
+        fb.emit(indent + 1, "{0} = {1}({0})".format(value, fb.bind(field.to_storage, "s")))
+
+
+def emit_nested_load(fb, field, indent, value, depth):
+    """Emits code that turns the mapping in ``value`` into an instance of the nested schema of
+    ``field``, or every mapping of a list for nested fields with ``many=True``.
+
+    The nested populate code is inlined. Values of other types are left as they are for
+    validation to reject.
+    """
+    schema = nested_schema(field)
+    fb.define("Mapping", Mapping)
+    model = fb.bind(schema._meta_model, "m")
+    fields = unique_fields(schema._fields)
+    child = local("child", depth)
+    is_mapping = "type({0}) is dict or isinstance({0}, Mapping)"
+
+    if not field._many:
+        fb.emit(indent, "if {0}:".format(is_mapping.format(value)))
+        fb.emit(indent + 1, "{0} = {1}()".format(child, model))
+        emit_populate(fb, fields, indent + 1, child, value, schema._fresh_model, depth)
+        fb.emit(indent + 1, "{0} = {1}".format(value, child))
+        return
+
+    item, items = local("item", depth), local("items", depth)
+    fb.emit(indent, "if isinstance({0}, (list, tuple)):".format(value))
+    fb.emit(indent + 1, "{0} = []".format(items))
+    fb.emit(indent + 1, "for {0} in {1}:".format(item, value))
+    fb.emit(indent + 2, "if {0}:".format(is_mapping.format(item)))
+    fb.emit(indent + 3, "{0} = {1}()".format(child, model))
+    emit_populate(fb, fields, indent + 3, child, item, schema._fresh_model, depth)
+    fb.emit(indent + 3, "{0} = {1}".format(item, child))
+    fb.emit(indent + 2, "{0}.append({1})".format(items, item))
+    fb.emit(indent + 1, "{0} = {1}".format(value, items))
+
+
+def compile_populate(fields, fresh=False, owner=""):
+    """Compiles ``populate(instance, data)`` that fills ``instance`` with values for ``fields``.
+
+    A value is taken from ``data``; if it is missing or ``None`` the current attribute on the
+    instance is kept and finally the field default is used. When ``fresh`` is set the instance is
+    known to be newly created and empty, so the instance lookup is skipped. Mappings given for
+    nested fields are populated into new instances of the nested schema's model and lists of a
+    ``ListField`` with ``storage`` are converted to arrays.
+    """
+    fb = FunctionBuilder("populate", ["instance", "data"])
+    emit_populate(fb, unique_fields(fields), 0, "instance", "data", fresh)
+    return fb.build(owner)
+
+
+def emit_load(fb, field, indent):
+    """Emits code that assigns the value of ``field`` in the input ``data`` to ``value``,
+    resolved like :func:`compile_populate` does for a fresh instance.
+    """
+    fb.emit(indent, "if data:")
+    emit_lookup(fb, field, indent + 1)
+    fb.emit(indent + 1, "if value is None:")
+    fb.emit(indent + 2, "value = {0}".format(default_expression(fb, field)))
+    emit_convert(fb, field, indent + 1, "value", 0)
+    fb.emit(indent, "else:")
+    fb.emit(indent + 1, "value = {0}".format(default_expression(fb, field)))
+
+
+def compile_field_loader(model, field, owner=""):
+    """Compiles ``load(instance)`` that returns the value of ``field`` from the input data kept
+    on a lazy instance of ``model``, see :class:`~avocato.objects.LazyObject`.
+    """
+    fb = FunctionBuilder("load", ["instance"])
+    fb.emit(0, "try:")
+    fb.emit(1, "data = {0}(instance)".format(fb.bind(model._lazy_data.__get__, "m")))
+    fb.emit(0, "except AttributeError:")
+    fb.emit(1, "data = None")
+    emit_load(fb, field, 0)
+    fb.emit(0, "return value")
+    return fb.build(owner)
+
+
+def compile_materialize(lazy_model, model, fields, owner=""):
+    """Compiles ``materialize(instance)`` that turns an instance of ``lazy_model`` into a fully
+    loaded instance of ``model``.
+
+    The input data is dropped and the class of the instance is switched first, so the fields
+    that haven't been loaded or set yet are then written to plain slots. Instances of other
+    classes are left as they are.
+    """
+    fields = unique_fields(fields)
+    fb = FunctionBuilder("materialize", ["instance"])
+    fb.define("AttributeError", AttributeError)
+    set_class = "{0}(instance, '__class__', {1})".format(
+        fb.bind(object.__setattr__, "m"), fb.bind(model, "m")
+    )
+    fb.emit(0, "if type(instance) is not {0}:".format(fb.bind(lazy_model, "m")))
+    fb.emit(1, "return")
+    fb.emit(0, "try:")
+    fb.emit(1, "data = {0}(instance)".format(fb.bind(model._lazy_data.__get__, "m")))
+    fb.emit(1, "loaded = {0}(instance)".format(fb.bind(model._lazy_loaded.__get__, "m")))
+    fb.emit(0, "except AttributeError:")
+    # Created without data, e.g. by hand: load the defaults of empty slots one by one.
+    for field in fields:
+        fb.emit(1, attribute("instance", field.name))
+    fb.emit(1, set_class)
+    fb.emit(1, "return")
+    fb.emit(0, "{0}(instance)".format(fb.bind(model._lazy_data.__delete__, "m")))
+    fb.emit(0, "{0}(instance)".format(fb.bind(model._lazy_loaded.__delete__, "m")))
+    fb.emit(0, set_class)
+    fb.emit(0, "if not loaded:")
+    emit_populate(fb, fields, 1, "instance", "data", fresh=True)
+    fb.emit(0, "else:")
+    if not fields:
+        fb.emit(1, "pass")
+    for field in fields:
+        fb.emit(1, "if {0!r} not in loaded:".format(field.name))
+        emit_load(fb, field, 2)
+        fb.emit(2, assign_attribute("instance", field.name, "value"))
+    return fb.build(owner)
+
+
+def compile_nested_load(field, owner=""):
+    """Compiles ``load(value)`` that returns ``value`` loaded like :func:`emit_nested_load`.
+    """
+    fb = FunctionBuilder("load", ["value"])
+    emit_nested_load(fb, field, 0, "value", 1)
+    fb.emit(0, "return value")
+    return fb.build(owner)
+
+
+def resolve_hook(object_cls, field):
+    """Returns the ``validate_<field>`` hook defined on ``object_cls`` or None.
+
+    Attributes of the base object class itself (e.g. ``validate_many``) aren't hooks.
+    """
+    name = "validate_{0}".format(field.name)
+    # The last class in the MRO created by the same metaclass is the base object class.
+    root = [cls for cls in object_cls.__mro__ if isinstance(cls, type(object_cls))][-1]
+    for cls in object_cls.__mro__:
+        if cls in root.__mro__:
+            return None
+        if name in vars(cls):
+            return vars(cls)[name]
+    return None
+
+
+def is_coroutine_check(check):
+    """Whether calling the validator or hook ``check`` returns a coroutine.
+    """
+    if isinstance(check, (staticmethod, classmethod)):
+        check = check.__func__
+    if inspect.iscoroutinefunction(check):
+        return True
+    return not inspect.isfunction(check) and inspect.iscoroutinefunction(
+        getattr(check, "__call__", None)
+    )
+
+
+def hook_call(fb, hook, field, value="value", owner="self"):
+    """Returns an expression calling ``hook`` with ``value``.
+
+    Plain functions are called directly, anything else (e.g. ``staticmethod``) goes through normal
+    attribute lookup on ``owner``.
+    """
+    if isinstance(hook, types.FunctionType):
+        return "{0}({1}, {2})".format(fb.bind(hook, "h"), owner, value)
+    return "{0}({1})".format(attribute(owner, "validate_{0}".format(field.name)), value)
+
+
+def overrides_call(validator):
+    """Whether ``validator`` overrides ``__call__`` below the class its ``check`` comes from.
+
+    Its ``check`` then doesn't know about the checks done by ``__call__`` and can't be used instead.
+    """
+    mro = type(validator).__mro__
+    call_owner = next((cls for cls in mro if "__call__" in vars(cls)), None)
+    check_owner = next((cls for cls in mro if "check" in vars(cls)), None)
+    if call_owner is None or check_owner is None:
+        return False
+    return not issubclass(check_owner, call_owner)
+
+
+def as_check(validator):
+    """Returns a ``check(value)`` for ``validator`` that returns the failure instead of raising.
+
+    Validators with a ``check`` method are used as they are; plain callables that raise
+    :class:`~avocato.exceptions.AvocatoValidationError` are wrapped so the exception is returned.
+    So are validators whose ``__call__`` is overridden below the class that defines ``check``,
+    e.g. a subclass of a built-in validator that only overrides ``__call__``.
+    """
+    check = getattr(validator, "check", None)
+    if check is not None and not overrides_call(validator):
+        return check
+
+    def check(value):
+        try:
+            validator(value)
+        except AvocatoValidationError as e:
+            return e
+        return None
+
+    return check
+
+
+def check_expression(fb, validators, value="value"):
+    """Returns an expression giving the first failure of ``validators`` on ``value`` or ``None``.
+    """
+    return " or ".join(
+        "{0}({1})".format(fb.bind(as_check(validator), "v"), value) for validator in validators
+    )
+
+
+#: Types whose values are always hashable, so they can be looked up in a frozenset directly.
+_HASHABLE_TYPES = frozenset([str, bytes, int, float, bool, type(None)])
+
+
+def failure_condition(fb, validator, value="value"):
+    """Returns an expression that is true exactly when the built-in ``validator`` rejects ``value``.
+
+    Returns ``None`` for validators that can't be inlined.
+    """
+    if type(validator) is Required:
+        return "not {0}".format(value)
+
+    if type(validator) is OneOfType:
+        choices = validator.choices
+        if isinstance(choices, type):
+            choices = (choices,)
+        elif type(choices) is not tuple:
+            return None
+        # ``isinstance`` is true for an exact type match anyway, ``is`` just gets there faster.
+        exact = [
+            "type({0}) is not {1}".format(value, fb.bind(choice, "t"))
+            for choice in choices if isinstance(choice, type)
+        ]
+        return " and ".join(exact + [
+            "not isinstance({0}, {1})".format(value, fb.bind(validator.choices, "t"))
+        ])
+
+    if type(validator) is Length:
+        length = "len({0})".format(value)
+        equal, min_length, max_length = (
+            None if limit is None else fb.bind(limit, "n")
+            for limit in (validator.equal, validator.min_length, validator.max_length)
+        )
+        if equal is not None:
+            return "{0} != {1}".format(length, equal)
+        if min_length is not None and max_length is not None:
+            return "not {0} <= {1} <= {2}".format(min_length, length, max_length)
+        if min_length is not None:
+            return "{0} < {1}".format(length, min_length)
+        if max_length is not None:
+            return "{0} > {1}".format(length, max_length)
+        return "False"
+
+    if type(validator) is OneOf:
+        if validator._index is None:
+            return None
+        # Values of other types may be unhashable, so they ask the validator.
+        return "({0} not in {1} if type({0}) in {2} else {3}({0}) is not None)".format(
+            value,
+            fb.bind(validator._index, "s"),
+            fb.bind(_HASHABLE_TYPES, "k"),
+            fb.bind(validator.check, "v"),
+        )
+
+    return None
+
+
+def emit_checks(fb, validators, indent, value="value", failure="failure"):
+    """Emits code that assigns the first failure of ``validators`` on ``value`` to ``failure``.
+
+    The leading run of built-in validators (``Required``, ``OneOfType``, ``Length``, ``OneOf``) is
+    fused into one ``if``/``elif`` chain of inline conditions, so a valid value costs no calls for
+    them. Only the branch of the failing validator calls its ``check`` to build the failure, which
+    keeps messages and first-failure-wins ordering identical. The rest of the validators are
+    called in order. Fused validators are specialised with their settings at class creation.
+    """
+    fused = []
+    for validator in validators:
+        condition = failure_condition(fb, validator, value)
+        if condition is None:
+            break
+        fused.append((validator, condition))
+    rest = validators[len(fused):]
+
+    if not fused:
+        fb.emit(indent, "{0} = {1}".format(failure, check_expression(fb, rest, value)))
+        return
+
+    for position, (validator, condition) in enumerate(fused):
+        fb.emit(indent, "{0} {1}:".format("elif" if position else "if", condition))
+        fb.emit(indent + 1, "{0} = {1}({2})".format(
+            failure, fb.bind(validator.check, "v"), value
+        ))
+    fb.emit(indent, "else:")
+    if rest:
+        fb.emit(indent + 1, "{0} = {1}".format(failure, check_expression(fb, rest, value)))
+    else:
+        fb.emit(indent + 1, "{0} = None".format(failure))
+
+
+#: Rejects values of nested fields that aren't mappings (or lists of them with ``many=True``).
+_NESTED_TYPE = OneOfType((Mapping,))
+_NESTED_LIST_TYPE = OneOfType((list, tuple))
+
+
+def emit_record(fb, indent, errors, key, messages):
+    """Emits code that stores ``messages`` under ``key`` in the lazily created dict ``errors``.
+    """
+    fb.emit(indent, "if {0} is None:".format(errors))
+    fb.emit(indent + 1, "{0} = {{}}".format(errors))
+    fb.emit(indent, "{0}[{1}] = {2}".format(errors, key, messages))
+
+
+def emit_hook_record(fb, indent, errors, field):
+    """Emits code that adds the messages of a failed hook to the errors of ``field``.
+
+    Nested fields and lists with element checks may already have a dict of nested errors, the
+    messages go under its ``"_schema"`` key then.
+    """
+    if not has_nested_errors(field):
+        fb.emit(indent, "{0}.setdefault({1!r}, []).extend(e.raw_messages)".format(
+            errors, field.name
+        ))
+        return
+    fb.emit(indent, "messages = {0}.setdefault({1!r}, [])".format(errors, field.name))
+    fb.emit(indent, "if type(messages) is dict:")
+    fb.emit(indent + 1, "messages = messages.setdefault('_schema', [])")
+    fb.emit(indent, "messages.extend(e.raw_messages)")
+
+
+def emit_validate_field(fb, field, hook, indent, errors, depth=0, owner="self"):
+    """Emits code that validates the value of ``field`` in the local ``value`` of ``depth``.
+
+    Errors are recorded in the dict ``errors`` under the field name, which is created on the
+    first error. Values of nested fields are validated against the nested schema's fields
+    with the code inlined; their errors are nested dicts, keyed by item index for lists.
+    Elements of a ``ListField(of=...)`` are checked in a loop, see :func:`emit_items_validate`.
+    """
+    value, failure = local("value", depth), local("failure", depth)
+    name = repr(field.name)
+    if field.validators:
+        emit_checks(fb, field.validators, indent, value, failure)
+        fb.emit(indent, "if {0} is not None:".format(failure))
+        emit_record(fb, indent + 1, errors, name, "list({0}.raw_messages)".format(failure))
+
+    if has_nested_errors(field):
+        fb.emit(indent, "{0} {1} is not None:".format("elif" if field.validators else "if", value))
+        emit_value_validate(fb, field, indent + 1, value, errors, depth + 1)
+
+    if hook is not None:
+        emit_hook(fb, field, hook, indent, errors, depth, owner)
+
+
+def emit_hook(fb, field, hook, indent, errors, depth=0, owner="self"):
+    """Emits code that calls the ``validate_<field>`` ``hook`` with the local ``value`` of
+    ``depth`` and records its failure in ``errors``.
+    """
+    fb.emit(indent, "try:")
+    fb.emit(indent + 1, hook_call(fb, hook, field, local("value", depth), owner))
+    fb.emit(indent, "except AvocatoValidationError as e:")
+    fb.emit(indent + 1, "if {0} is None:".format(errors))
+    fb.emit(indent + 2, "{0} = {{}}".format(errors))
+    emit_hook_record(fb, indent + 1, errors, field)
+
+
+def emit_validate_fields(
+    fb, object_cls, fields, indent, instance, errors, depth=0, owner="self", hooks_only=False
+):
+    """Emits :func:`emit_validate_field` for every field of ``instance`` that has checks.
+
+    With ``hooks_only``, fields only run their ``validate_<field>`` hook.
+    """
+    for field in fields:
+        hook = resolve_hook(object_cls, field)
+        if hooks_only and hook is None:
+            continue
+        if not field.validators and hook is None and not has_nested_errors(field):
+            continue
+        fb.emit(indent, "{0} = {1}".format(local("value", depth), attribute(instance, field.name)))
+        if hooks_only:
+            emit_hook(fb, field, hook, indent, errors, depth, owner)
+        else:
+            emit_validate_field(fb, field, hook, indent, errors, depth, owner)
+
+
+def emit_value_validate(fb, field, indent, value, errors, depth):
+    """Emits the checks of the nested schema or the list elements of ``field`` for ``value``.
+    """
+    if nested_schema(field) is not None:
+        emit_nested_validate(fb, field, indent, value, errors, depth)
+    else:
+        emit_items_validate(fb, field, indent, value, errors, depth)
+
+
+def emit_items_validate(fb, field, indent, value, errors, depth):
+    """Emits code that checks the elements of ``value`` of a ``ListField(of=...)``.
+
+    Element validators are fused like field validators and run in a single loop. Arrays are
+    converted to a list first, so elements are plain Python numbers. Failures are recorded in a
+    dict keyed by element index.
+    """
+    validators = item_validators(field)
+    items, index, item = local("items", depth), local("index", depth), local("item", depth)
+    failure, items_errors = local("failure", depth), local("errors", depth)
+    name = repr(field.name)
+
+    fb.emit(indent, "{0} = {1} if isinstance({1}, (list, tuple)) else {2}({1})".format(
+        items, value, fb.bind(ListField.items, "i")
+    ))
+    fb.emit(indent, "if {0} is None:".format(items))
+    emit_record(fb, indent + 1, errors, name, "[{0}({1})]".format(
+        fb.bind(ListField.sequence_type.check, "v"), value
+    ))
+    if not validators:
+        return
+    fb.emit(indent, "else:")
+    fb.emit(indent + 1, "{0} = None".format(items_errors))
+    fb.emit(indent + 1, "for {0}, {1} in enumerate({2}):".format(index, item, items))
+    emit_checks(fb, validators, indent + 2, item, failure)
+    fb.emit(indent + 2, "if {0} is not None:".format(failure))
+    emit_record(fb, indent + 3, items_errors, index, "list({0}.raw_messages)".format(failure))
+    fb.emit(indent + 1, "if {0} is not None:".format(items_errors))
+    emit_record(fb, indent + 2, errors, name, items_errors)
+
+
+def schema_binder(schema):
+    """Returns ``bind(instance)`` that creates an object of ``schema`` for an existing ``instance``.
+
+    The object isn't initialized, it only has its ``instance`` set, so its fields read the
+    values of ``instance``. Hooks of nested schemas get one as ``self``.
+    """
+    new = schema.__new__
+
+    def bind(instance):
+        obj = new(schema)
+        obj.instance = instance
+        return obj
+
+    return bind
+
+
+def emit_nested_validate(fb, field, indent, value, errors, depth):
+    """Emits code that validates ``value`` of the nested ``field`` against its schema.
+
+    Hooks of the nested schema get an object of the nested schema bound to the nested value as
+    ``self``, see :func:`schema_binder`. It is only created if the schema has hooks.
+    """
+    schema = nested_schema(field)
+    fb.define("AvocatoValidationError", AvocatoValidationError)
+    model = fb.bind(schema._meta_model, "m")
+    fields = unique_fields(schema._fields)
+    nested_errors = local("errors", depth)
+    owner = local("owner", depth)
+    has_hooks = any(resolve_hook(schema, nested) is not None for nested in fields)
+    bind = fb.bind(schema_binder(schema), "b") if has_hooks else None
+    name = repr(field.name)
+
+    if not field._many:
+        fb.emit(indent, "if isinstance({0}, {1}):".format(value, model))
+        fb.emit(indent + 1, "{0} = None".format(nested_errors))
+        if has_hooks:
+            fb.emit(indent + 1, "{0} = {1}({2})".format(owner, bind, value))
+        emit_validate_fields(fb, schema, fields, indent + 1, value, nested_errors, depth, owner)
+        fb.emit(indent + 1, "if {0} is not None:".format(nested_errors))
+        emit_record(fb, indent + 2, errors, name, nested_errors)
+        fb.emit(indent, "else:")
+        emit_record(fb, indent + 1, errors, name, "[{0}({1})]".format(
+            fb.bind(_NESTED_TYPE.check, "v"), value
+        ))
+        return
+
+    index, item, items_errors = local("index", depth), local("item", depth), local("items", depth)
+    fb.emit(indent, "if isinstance({0}, list):".format(value))
+    fb.emit(indent + 1, "{0} = None".format(items_errors))
+    fb.emit(indent + 1, "for {0}, {1} in enumerate({2}):".format(index, item, value))
+    fb.emit(indent + 2, "if isinstance({0}, {1}):".format(item, model))
+    fb.emit(indent + 3, "{0} = None".format(nested_errors))
+    if has_hooks:
+        fb.emit(indent + 3, "{0} = {1}({2})".format(owner, bind, item))
+    emit_validate_fields(fb, schema, fields, indent + 3, item, nested_errors, depth, owner)
+    fb.emit(indent + 3, "if {0} is not None:".format(nested_errors))
+    emit_record(fb, indent + 4, items_errors, index, nested_errors)
+    fb.emit(indent + 2, "else:")
+    emit_record(fb, indent + 3, items_errors, index, "[{0}({1})]".format(
+        fb.bind(_NESTED_TYPE.check, "v"), item
+    ))
+    fb.emit(indent + 1, "if {0} is not None:".format(items_errors))
+    emit_record(fb, indent + 2, errors, name, items_errors)
+    fb.emit(indent, "else:")
+    emit_record(fb, indent + 1, errors, name, "[{0}({1})]".format(
+        fb.bind(_NESTED_LIST_TYPE.check, "v"), value
+    ))
+
+
+def compile_validate(object_cls, fields, owner=""):
+    """Compiles ``validate(self, instance)`` that runs validators and hooks of ``fields``.
+
+    Validators of a field run until the first one fails, the ``validate_<field>`` hook runs
+    regardless. Validators are checked with :func:`emit_checks`, so rejecting a value doesn't
+    raise and catch an exception. The function returns a dict of error messages per field
+    name, or ``None`` if everything is valid; the dict is only created once the first error
+    happens.
+    """
+    fb = FunctionBuilder("validate", ["self", "instance"])
+    fb.define("AvocatoValidationError", AvocatoValidationError)
+    fb.emit(0, "errors = None")
+    emit_validate_fields(fb, object_cls, unique_fields(fields), 0, "instance", "errors")
+    fb.emit(0, "return errors")
+    return fb.build(owner)
+
+
+def compile_field_checks(fields, owner=""):
+    """Compiles ``check(instance, errors)`` for every field of ``fields`` that has validators or
+    nested values to check, and returns them keyed by field name.
+
+    A check runs the validators of its field like :func:`compile_validate`, without the hook,
+    and returns ``errors``, which is created on the first error if it is ``None``.
+    """
+    checks = {}
+    for field in unique_fields(fields):
+        if not field.validators and not has_nested_errors(field):
+            continue
+        fb = FunctionBuilder("check_field", ["instance", "errors"])
+        fb.define("AvocatoValidationError", AvocatoValidationError)
+        fb.emit(0, "value = {0}".format(attribute("instance", field.name)))
+        emit_validate_field(fb, field, None, 0, "errors")
+        fb.emit(0, "return errors")
+        checks[field.name] = fb.build(owner)
+    return checks
+
+
+def compile_hooks(object_cls, fields, owner=""):
+    """Compiles ``run_hooks(self, instance, errors)`` that calls the ``validate_<field>`` hooks
+    of ``fields`` and returns ``errors``, which is created on the first error if it is ``None``.
+    """
+    fb = FunctionBuilder("run_hooks", ["self", "instance", "errors"])
+    fb.define("AvocatoValidationError", AvocatoValidationError)
+    emit_validate_fields(
+        fb, object_cls, unique_fields(fields), 0, "instance", "errors", hooks_only=True
+    )
+    fb.emit(0, "return errors")
+    return fb.build(owner)
+
+
+def compile_nested_check(field, owner=""):
+    """Compiles ``check(value)`` that validates a value of the nested ``field`` against its
+    schema (or the elements of a ``ListField(of=...)``) and returns a dict with its errors
+    under the field name, or ``None``.
+    """
+    fb = FunctionBuilder("check_nested", ["value"])
+    fb.emit(0, "errors = None")
+    emit_value_validate(fb, field, 0, "value", "errors", 1)
+    fb.emit(0, "return errors")
+    return fb.build(owner)
+
+
+#: Converters that can be skipped when the value already has exactly that type.
+_TYPE_CONVERTERS = (str, int, float, bool)
+
+
+def json_expression(fb, field, value):
+    """Returns an expression converting ``value`` with :meth:`Field.to_json_value`.
+
+    ``None`` is passed through as is, so optional fields serialize to ``null``.
+    """
+    if type(field).to_json_value is Field.to_json_value:
+        return value
+    converter = field.to_json_value
+    if converter in _TYPE_CONVERTERS:
+        return "{0} if {0} is None or type({0}) is {1} else {1}({0})".format(
+            value, fb.bind(converter, "t")
+        )
+    return "None if {0} is None else {1}({0})".format(value, fb.bind(converter, "j"))
+
+
+def compile_to_dict(fields, mode="python", owner=""):
+    """Compiles ``to_dict(instance)`` that returns a dict of ``fields`` keyed by their labels.
+
+    In ``"json"`` mode every value is passed through the field's :meth:`Field.to_json_value`, so
+    the result can be handed straight to :func:`json.dumps`.
+    """
+    fb = FunctionBuilder("to_dict", ["instance"])
+    items = []
+    for index, field in enumerate(unique_fields(fields)):
+        value = attribute("instance", field.name)
+        if nested_schema(field) is not None:
+            value = nested_dict_expression(fb, field, value, mode, 1)
+        elif mode == "json":
+            name = "value{0}".format(index)
+            expression = json_expression(fb, field, name)
+            if expression != name:
+                fb.emit(0, "{0} = {1}".format(name, value))
+                value = expression
+        items.append("{0!r}: {1}".format(field.label or field.name, value))
+    fb.emit(0, "return {{{0}}}".format(", ".join(items)))
+    return fb.build(owner)
+
+
+def dict_display(fb, fields, source, mode, depth):
+    """Returns a dict display of ``fields`` read from the instance expression ``source``.
+    """
+    items = []
+    for field in fields:
+        value = attribute(source, field.name)
+        if nested_schema(field) is not None:
+            value = nested_dict_expression(fb, field, value, mode, depth + 1)
+        elif mode == "json":
+            value = json_expression(fb, field, value)
+        items.append("{0!r}: {1}".format(field.label or field.name, value))
+    return "{{{0}}}".format(", ".join(items))
+
+
+def nested_dict_expression(fb, field, value, mode, depth):
+    """Returns an expression converting ``value`` of the nested ``field`` like ``to_dict`` does:
+    to a dict, or a list of dicts with ``many=True``. ``None`` is passed through.
+    """
+    fields = unique_fields(nested_schema(field)._fields)
+    if not field._many:
+        return "(None if {0} is None else {1})".format(
+            value, dict_display(fb, fields, value, mode, depth)
+        )
+    item = local("item", depth)
+    return "(None if {0} is None else [{1} for {2} in {0}])".format(
+        value, dict_display(fb, fields, item, mode, depth), item
+    )
+
+
+#: Encodes anything ``to_json_value`` may return, in the same compact form as the fragments.
+_dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def _encode_float(value):
+    value = float(value)
+    if value != value:
+        return "NaN"
+    if value == float("inf"):
+        return "Infinity"
+    if value == -float("inf"):
+        return "-Infinity"
+    return float.__repr__(value)
+
+
+#: Converters whose results are always strings.
+_STR_CONVERTERS = (DecimalField.to_json_value, DateTimeField.to_json_value)
+
+
+def json_fragment_expression(fb, field, value):
+    """Returns an expression encoding ``value`` of ``field`` as a JSON text fragment.
+
+    Mirrors :func:`json_expression` followed by :func:`json.dumps`, but fields whose
+    :meth:`Field.to_json_value` returns a known type get an encoder for just that type.
+    """
+    if nested_schema(field) is not None:
+        return "{0}({1})".format(
+            fb.bind(_dumps, "e"), nested_dict_expression(fb, field, value, "json", 1)
+        )
+    converter = field.to_json_value
+    if type(field).to_json_value is Field.to_json_value:
+        encoded = None
+    elif converter is str:
+        encoded = "{0}({1} if type({1}) is str else str({1}))".format(
+            fb.bind(json.encoder.encode_basestring, "e"), value
+        )
+    elif converter in _STR_CONVERTERS:
+        encoded = "{0}({1}({2}))".format(
+            fb.bind(json.encoder.encode_basestring, "e"), fb.bind(converter, "j"), value
+        )
+    elif converter is int:
+        encoded = "{0}({1} if type({1}) is int else int({1}))".format(
+            fb.bind(int.__repr__, "e"), value
+        )
+    elif converter is float:
+        encoded = "{0}({1})".format(fb.bind(_encode_float, "e"), value)
+    elif converter is bool:
+        encoded = "('true' if {0} else 'false')".format(value)
+    else:
+        encoded = None
+
+    if encoded is None:
+        return "{0}({1})".format(fb.bind(_dumps, "e"), json_expression(fb, field, value))
+    return "'null' if {0} is None else {1}".format(value, encoded)
+
+
+def json_template(fields):
+    """Returns a ``%`` template of a JSON object with the escaped labels of ``fields`` filled in.
+    """
+    items = [
+        "{0}:%s".format(_dumps(field.label or field.name).replace("%", "%%"))
+        for field in fields
+    ]
+    return "{{{0}}}".format(",".join(items))
+
+
+def compile_to_json(fields, owner=""):
+    """Compiles ``to_json(instance)`` that returns the JSON text of ``compile_to_dict(fields,
+    "json")`` without building the dict.
+
+    Keys are written into a template once, values are encoded by
+    :func:`json_fragment_expression`.
+    """
+    fb = FunctionBuilder("to_json", ["instance"])
+    fields = unique_fields(fields)
+    values = []
+    for index, field in enumerate(fields):
+        local = "value{0}".format(index)
+        fb.emit(0, "{0} = {1}".format(local, attribute("instance", field.name)))
+        values.append(json_fragment_expression(fb, field, local))
+    if not fields:
+        fb.emit(0, "return '{}'")
+    else:
+        fb.emit(0, "return {0} % ({1},)".format(
+            fb.bind(json_template(fields), "k"), ", ".join(values)
+        ))
+    return fb.build(owner)
+
+
+def select_columns(fields, names):
+    """Returns ``(column_index, field)`` pairs of ``fields``, limited to ``names`` if given.
+    """
+    return [
+        (index, field)
+        for index, field in enumerate(unique_fields(fields))
+        if names is None or field.name in names
+    ]
+
+
+def emit_rows(fb, values, columns, names, row):
+    """Emits ``return`` of a list with the ``row`` expression of ``values`` for every row.
+
+    Without ``names`` all columns are zipped, otherwise only ``columns``.
+    """
+    if not values:
+        # Rows of an empty projection are still there, just without values.
+        fb.emit(0, "return [{0} for _ in columns[0]] if columns else []".format(row)
+                if names is not None else "return []")
+        return
+    fb.emit(0, "return [{0} for {1}, in zip({2})]".format(
+        row, ", ".join(values), "*columns" if names is None else ", ".join(columns)
+    ))
+
+
+def compile_rows_to_json(fields, names=None, owner=""):
+    """Compiles ``rows_to_json(columns)``, the batch counterpart of :func:`compile_to_json`.
+
+    Returns a list with the JSON text of every row. With ``names``, only the columns of those
+    fields are included.
+    """
+    fb = FunctionBuilder("rows_to_json", ["columns"])
+    selected = select_columns(fields, names)
+    values = ["value{0}".format(index) for index, _ in selected]
+    columns = ["columns[{0}]".format(index) for index, _ in selected]
+    fragments = [
+        json_fragment_expression(fb, field, value)
+        for (_, field), value in zip(selected, values)
+    ]
+    template = json_template([field for _, field in selected])
+    if values:
+        row = "{0} % ({1},)".format(fb.bind(template, "k"), ", ".join(fragments))
+    else:
+        row = repr(template)
+    emit_rows(fb, values, columns, names, row)
+    return fb.build(owner)
+
+
+def compile_field_property(name, owner=""):
+    """Returns a data descriptor that forwards the field ``name`` to ``self.instance``.
+
+    Setting the field records ``name`` in the ``_changed`` and ``_unvalidated`` sets of the
+    object, which are created on the first change.
+    """
+    if is_attribute_name(name):
+        getter = operator.attrgetter("instance.{0}".format(name))
+    else:
+        fb = FunctionBuilder("get_value", ["self"])
+        fb.emit(0, "return {0}".format(attribute("self.instance", name)))
+        getter = fb.build(owner)
+
+    fb = FunctionBuilder("set_value", ["self", "value"])
+    fb.emit(0, assign_attribute("self.instance", name, "value"))
+    for changes in ("_changed", "_unvalidated"):
+        fb.emit(0, "if self.{0} is None:".format(changes))
+        fb.emit(1, "self.{0} = {{{1!r}}}".format(changes, name))
+        fb.emit(0, "else:")
+        fb.emit(1, "self.{0}.add({1!r})".format(changes, name))
+    return property(getter, fb.build(owner), doc="Value of the ``{0}`` field.".format(name))
+
+
+def compile_columns(fields, owner=""):
+    """Compiles ``columns(rows)`` that transposes a list of mappings into one list per field.
+
+    Values are resolved like :func:`compile_populate` does for a fresh instance: a missing or
+    ``None`` value is replaced by the field default, nested values are loaded and lists are
+    converted to the storage of their ``ListField``.
+    """
+    fb = FunctionBuilder("columns", ["rows"])
+    fields = unique_fields(fields)
+    columns = ["column{0}".format(index) for index in range(len(fields))]
+    appends = ["append{0}".format(index) for index in range(len(fields))]
+    for column, append in zip(columns, appends):
+        fb.emit(0, "{0} = []".format(column))
+        fb.emit(0, "{0} = {1}.append".format(append, column))
+    if fields:
+        fb.emit(0, "for row in rows:")
+        fb.emit(1, "if row:")
+        for field, append in zip(fields, appends):
+            emit_lookup(fb, field, 2, source="row")
+            fb.emit(2, "{0}(value)".format(append))
+        fb.emit(1, "else:")
+        for append in appends:
+            fb.emit(2, "{0}(None)".format(append))
+
+    for field, column in zip(fields, columns):
+        default = default_expression(fb, field)
+        if default != "None":
+            fb.emit(0, "{0} = [{1} if value is None else value for value in {0}]".format(
+                column, default
+            ))
+        if nested_schema(field) is not None:
+            fb.emit(0, "{0} = [{1}(value) for value in {0}]".format(
+                column, fb.bind(compile_nested_load(field, owner), "n")
+            ))
+        elif getattr(field, "storage", None) is not None:
+            fb.emit(0, "{0} = [{1}(value) for value in {0}]".format(
+                column, fb.bind(field.to_storage, "s")
+            ))
+    fb.emit(0, "return [{0}]".format(", ".join(columns)))
+    return fb.build(owner)
+
+
+def compile_column_checks(object_cls, fields, owner=""):
+    """Compiles the checks used to validate a batch column by column.
+
+    Returns a list of ``(column_index, field, check_validators, check_hook)`` tuples for fields
+    that have anything to check. ``check_validators(column, errors)`` runs the field's validator
+    chain over a whole column and ``check_hook(self, column, errors)`` calls the
+    ``validate_<field>`` hook for every value; either is ``None`` if there is nothing to run.
+    Failures are recorded in ``errors``, a dict mapping row indexes to per-row error dicts.
+    """
+    checks = []
+    for index, field in enumerate(unique_fields(fields)):
+        hook = resolve_hook(object_cls, field)
+        check_validators = check_hook = None
+
+        if has_nested_errors(field):
+            fb = FunctionBuilder("check_validators", ["column", "errors"])
+            fb.emit(0, "for index, value in enumerate(column):")
+            fb.emit(1, "field_errors = None")
+            emit_validate_field(fb, field, None, 1, "field_errors")
+            fb.emit(1, "if field_errors is not None:")
+            fb.emit(2, "row_errors = errors.get(index)")
+            fb.emit(2, "if row_errors is None:")
+            fb.emit(3, "errors[index] = row_errors = {}")
+            fb.emit(2, "row_errors.update(field_errors)")
+            check_validators = fb.build(owner)
+        elif field.validators:
+            fb = FunctionBuilder("check_validators", ["column", "errors"])
+            fb.emit(0, "for index, value in enumerate(column):")
+            emit_checks(fb, field.validators, 1)
+            fb.emit(1, "if failure is not None:")
+            fb.emit(2, "row_errors = errors.get(index)")
+            fb.emit(2, "if row_errors is None:")
+            fb.emit(3, "errors[index] = row_errors = {}")
+            fb.emit(2, "row_errors[{0!r}] = list(failure.raw_messages)".format(field.name))
+            check_validators = fb.build(owner)
+
+        if hook is not None:
+            fb = FunctionBuilder("check_hook", ["self", "column", "errors"])
+            fb.define("AvocatoValidationError", AvocatoValidationError)
+            fb.emit(0, "for index, value in enumerate(column):")
+            fb.emit(1, "try:")
+            fb.emit(2, hook_call(fb, hook, field))
+            fb.emit(1, "except AvocatoValidationError as e:")
+            fb.emit(2, "row_errors = errors.get(index)")
+            fb.emit(2, "if row_errors is None:")
+            fb.emit(3, "errors[index] = row_errors = {}")
+            emit_hook_record(fb, 2, "row_errors", field)
+            check_hook = fb.build(owner)
+
+        if check_validators is not None or check_hook is not None:
+            checks.append((index, field, check_validators, check_hook))
+    return checks
+
+
+def compile_rows_to_dicts(fields, mode="python", names=None, owner=""):
+    """Compiles ``rows_to_dicts(columns)``, the batch counterpart of :func:`compile_to_dict`.
+
+    Takes the columns produced by :func:`compile_columns` and returns one dict per row. With
+    ``names``, only the columns of those fields are included.
+    """
+    fb = FunctionBuilder("rows_to_dicts", ["columns"])
+    values = []
+    columns = []
+    items = []
+    for index, field in select_columns(fields, names):
+        value = "value{0}".format(index)
+        values.append(value)
+        columns.append("columns[{0}]".format(index))
+        if nested_schema(field) is not None:
+            value = nested_dict_expression(fb, field, value, mode, 1)
+        elif mode == "json":
+            value = json_expression(fb, field, value)
+        items.append("{0!r}: {1}".format(field.label or field.name, value))
+    emit_rows(fb, values, columns, names, "{{{0}}}".format(", ".join(items)))
+    return fb.build(owner)
@@ -1,24 +1,80 @@
-
 class AvocatoError(Exception):
     """Base avocato exception.
     """
 
 
+class ValidationFailure(object):
+    """A failed validation whose message is rendered only when it is needed.
+
+    Keeps the validator, the invalid value and the message template instead of a formatted
+    string, so rejecting a value doesn't pay for string formatting unless the error is read.
+    """
+    __slots__ = ('validator', 'value', 'template')
+
+    def __init__(self, validator, value, template=None):
+        self.validator = validator
+        self.value = value
+        self.template = template
+
+    @property
+    def message(self):
+        if self.template is None:
+            return self.validator._format_error(self.value)
+        return self.validator._format_error(self.value, self.template)
+
+    @property
+    def raw_messages(self):
+        """The failure as a list of messages, so it's recorded like a raised error.
+        """
+        return [self]
+
+    def __str__(self):
+        return self.message
+
+    def __repr__(self):
+        return '<ValidationFailure({0!r})>'.format(self.message)
+
+
+def render_messages(messages):
+    """Turns :class:`ValidationFailure` objects in a (nested) error structure into strings.
+    """
+    if isinstance(messages, dict):
+        return {key: render_messages(value) for key, value in messages.items()}
+    if isinstance(messages, list):
+        return [render_messages(message) for message in messages]
+    if isinstance(messages, ValidationFailure):
+        return messages.message
+    return messages
+
+
 class AvocatoValidationError(AvocatoError):
     """Exception used for validating values.
+
+    ``message`` may be a string, a :class:`ValidationFailure` or a list or dict of them. Messages
+    and field names are normalised when they are first read.
     """
     def __init__(self, message, field_names=None, data=None, valid_data=None, **kwargs):
-        if not isinstance(message, dict) and not isinstance(message, list):
-            self.messages = [message]
-        else:
-            self.messages = message
-
-        if isinstance(field_names, str):
-            self.field_names = [field_names]
-        else:
-            self.field_names = field_names or []
-
+        self.message = message
+        self._field_names = field_names
         self.data = data
         self.valid_data = valid_data
         self.kwargs = kwargs
         AvocatoError.__init__(self, message)
+
+    @property
+    def raw_messages(self):
+        """Messages as they were given, with failures not rendered yet.
+        """
+        if not isinstance(self.message, dict) and not isinstance(self.message, list):
+            return [self.message]
+        return self.message
+
+    @property
+    def messages(self):
+        return render_messages(self.raw_messages)
+
+    @property
+    def field_names(self):
+        if isinstance(self._field_names, str):
+            return [self._field_names]
+        return self._field_names or []
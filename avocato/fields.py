@@ -1,3 +1,5 @@
+import array
+import functools
 from datetime import datetime
 from decimal import Decimal
 
@@ -113,14 +115,17 @@ class StrField(Field):
 
 class EmailField(StrField):
     """Converts input value to email.
+
+    ``cache_size`` is passed to the :class:`~avocato.validators.Email` validator.
     """
 
     accepted_types = (str,)
     to_json_value = staticmethod(str)
 
     def __init__(self, **kwargs):
+        cache_size = kwargs.pop("cache_size", None)
         super().__init__(**kwargs)
-        self.validators.append(avocato_validators.Email())
+        self.validators.append(avocato_validators.Email(cache_size=cache_size))
 
 
 class IntField(Field):
@@ -186,10 +191,96 @@ class DictField(Field):
 
 
 class ListField(Field):
+    """Converts input value to list.
+
+    :param Field of: Field describing the elements of the list. If present, every element is
+        checked with the validators of ``of`` when ``is_valid`` is called, except its
+        ``Required`` validator, so items like ``0`` or ``""`` are valid. Errors of invalid
+        elements are keyed by their index.
+    :param str storage: How lists of an ``IntField`` or ``FloatField`` are kept on the instance:
+        ``"array"`` for an :class:`array.array` (int64 or double) or ``"numpy"`` for a NumPy
+        array. Only lists whose elements all have exactly the type of ``of`` are stored, so
+        e.g. ints aren't cast to floats. Others, e.g. with a string or ``None``, are kept as
+        they are, so validation can report the elements.
+    """
+
+    #: Type codes of :class:`array.array` used for ``storage``.
+    typecodes = {IntField: "q", FloatField: "d"}
+    #: Rejects values that aren't lists, tuples or arrays.
+    sequence_type = avocato_validators.OneOfType((list, tuple, array.array))
+
+    def __init__(self, of=None, storage=None, **kwargs):
+        self.of = of
+        self.storage = storage
+        super().__init__(**kwargs)
+        if self.required:
+            # NumPy arrays with more than one element have no truth value.
+            self.validators[0] = avocato_validators.NotEmpty()
+
+        self.item_validators = None
+        if of is not None:
+            self.item_validators = [
+                validator for validator in of.validators
+                if type(validator) is not avocato_validators.Required
+            ]
+
+        self._to_array = None
+        if storage is not None:
+            if storage not in ("array", "numpy"):
+                raise ValueError(
+                    "Unknown storage {0!r}, expected 'array' or 'numpy'.".format(storage)
+                )
+            typecode = self.typecodes.get(type(of))
+            if typecode is None:
+                raise ValueError("Storage needs `of` to be an IntField or a FloatField.")
+            self._item_type = of.accepted_types[0]
+            if storage == "numpy":
+                from .vendors.numpy import array_converter
+
+                self._to_array = array_converter(typecode)
+            else:
+                self._to_array = functools.partial(array.array, typecode)
+
     @property
     def default(self):
         return []
 
+    @staticmethod
+    def items(value):
+        """Returns the elements of a list, tuple or array ``value``, or ``None`` for other values.
+        """
+        if isinstance(value, (list, tuple)):
+            return value
+        tolist = getattr(value, "tolist", None)
+        if tolist is None:
+            return None
+        return tolist()
+
+    def to_storage(self, value):
+        """Returns a list or tuple ``value`` in the ``storage`` of the field.
+
+        Other values and lists with elements of another type than ``of`` accepts are returned as
+        they are.
+        """
+        if self._to_array is None or not isinstance(value, (list, tuple)):
+            return value
+        item_type = self._item_type
+        if not all(type(item) is item_type for item in value):
+            return value
+        try:
+            return self._to_array(value)
+        except (TypeError, OverflowError):
+            return value
+
+    @staticmethod
+    def to_json_value(value):
+        if value is None:
+            return None
+        tolist = getattr(value, "tolist", None)
+        if tolist is None:
+            return list(value)
+        return tolist()
+
 
 class MethodField(Field):
     """Calls a method on the :class:`Serializer` to get the value.
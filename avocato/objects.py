@@ -1,23 +1,209 @@
+import asyncio
+import importlib
+import inspect
+import itertools
+import json
 import operator
-from collections import defaultdict
+import os
+import pickle
+import types
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 
-from .exceptions import AvocatoError, AvocatoValidationError
+from . import compiler, records
+from .exceptions import AvocatoError, AvocatoValidationError, render_messages
 from .fields import Field
 
+try:
+    from .vendors import numpy as numpy_backend
+except ImportError:  # pragma: no cover
+    numpy_backend = None
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # pragma: no cover
+    shared_memory = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 
 class Object(object):
     pass
 
 
+class SlotsObject(object):
+    """Base class for instance classes generated for objects without ``Meta.model``.
+
+    Subclasses get one slot per field, so instances don't carry a ``__dict__``.
+    """
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "<{0}({1})>".format(
+            type(self).__name__,
+            ", ".join(
+                "{0}={1!r}".format(name, getattr(self, name, None))
+                for name in self.__slots__
+            ),
+        )
+
+
+class LazySlots(SlotsObject):
+    """Base class for instance classes of objects with ``Meta.lazy``.
+
+    Holds the input data of instances whose fields haven't all been loaded yet.
+    """
+
+    __slots__ = ("_lazy_data", "_lazy_loaded")
+
+
+class LazyObject(SlotsObject):
+    """Base class for the lazy counterpart of an instance class with :class:`LazySlots`.
+
+    Instances keep the input data and load each field into its slot the first time it is read.
+    Fields that have been loaded or set are recorded, so materializing the instance (see
+    :func:`~avocato.compiler.compile_materialize`) leaves them alone and switches it to the
+    plain instance class, which reads slots without the ``__getattr__`` hook.
+    """
+
+    __slots__ = ()
+
+    #: Compiled ``load(instance)`` function of every field, by field name.
+    _loaders = {}
+
+    def __getattr__(self, name):
+        # Only called for empty slots and unknown names.
+        try:
+            loader = self._loaders[name]
+        except KeyError:
+            raise AttributeError(
+                "{0!r} object has no attribute {1!r}".format(type(self).__name__, name)
+            ) from None
+        value = loader(self)
+        setattr(self, name, value)
+        return value
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        try:
+            loaded = _get_loaded(self)
+        except AttributeError:
+            return
+        loaded.add(name)
+
+    def __repr__(self):
+        return "<{0}({1})>".format(
+            type(self).__name__,
+            ", ".join("{0}={1!r}".format(name, getattr(self, name)) for name in self._loaders),
+        )
+
+
+_set_data = LazySlots._lazy_data.__set__
+_get_loaded = LazySlots._lazy_loaded.__get__
+_set_loaded = LazySlots._lazy_loaded.__set__
+
+
+def _keep_data(instance, data):
+    """Populates a :class:`LazyObject` instance by keeping a reference to ``data``.
+    """
+    _set_data(instance, data)
+    _set_loaded(instance, set())
+
+
+def _json_loads(data):
+    """Decodes a JSON document given as bytes or str, with orjson if it is installed.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode("utf-8")
+    return json.loads(data)
+
+
+def _import_object_class(module_name, qualname):
+    obj = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+def _create_segment(size):
+    """Returns a new shared memory segment of ``size`` bytes, or None if it can't be created.
+
+    Writing to a segment that doesn't fit into ``/dev/shm`` kills the process with SIGBUS instead
+    of raising, so the free space is checked first where there is one.
+    """
+    try:
+        stat = os.statvfs("/dev/shm")
+    except (AttributeError, OSError):
+        pass
+    else:
+        if stat.f_bavail * stat.f_frsize < size:
+            return None
+    try:
+        return shared_memory.SharedMemory(create=True, size=size)
+    except OSError:
+        return None
+
+
+def _release_segment(shm):
+    shm.close()
+    shm.unlink()
+
+
+def _submit_chunk(executor, schema, chunk):
+    """Submits a chunk of ``AvocatoObject.validate_many`` to ``executor`` and returns the future.
+
+    The chunk is handed over through shared memory instead of the worker's pipe if a segment can
+    be created. The segment is released as soon as the future is done.
+    """
+    if shared_memory is None:
+        return executor.submit(_validate_chunk, schema, chunk)
+    payload = pickle.dumps(chunk, protocol=pickle.HIGHEST_PROTOCOL)
+    shm = _create_segment(max(1, len(payload)))
+    if shm is None:
+        return executor.submit(_validate_chunk, schema, chunk)
+    try:
+        shm.buf[:len(payload)] = payload
+        future = executor.submit(_validate_chunk, schema, None, shm.name, len(payload))
+    except BaseException:
+        _release_segment(shm)
+        raise
+    future.add_done_callback(lambda _: _release_segment(shm))
+    return future
+
+
+def _validate_chunk(schema, chunk, shm_name=None, size=None):
+    """Validates a chunk of records in a worker process of ``AvocatoObject.validate_many``.
+    """
+    if shm_name is not None:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        try:
+            chunk = pickle.loads(shm.buf[:size])
+        finally:
+            shm.close()
+    batch = _import_object_class(*schema)(chunk, many=True)
+    batch.is_valid()
+    return batch.valid_data, batch.errors
+
+
 # TODO: try and refactor this
 def _compile_fields(field, name, object_cls):
     getter = field.as_getter(name, object_cls)
+    key = None
     if getter is None:
-        getter = operator.itemgetter(field.attr or name)
+        key = field.attr or name
+        getter = operator.itemgetter(key)
 
     # Set the field name to a supplied label; defaults to the attribute name.
     field.name = name
     field._getter = getter
+    # Key looked up directly by the compiled functions, None when a custom getter is used.
+    field._key = key
     return field
 
 
@@ -40,7 +226,124 @@ class AvocatoObjectMeta(type):
 
     @staticmethod
     def parse_meta_class(cls, meta_cls, direct_fields):
-        return None, None
+        return getattr(meta_cls, "model", None), {}
+
+    @staticmethod
+    def _make_meta_model(object_cls, field_names):
+        names = tuple(dict.fromkeys(field_names))
+        if not all(compiler.is_attribute_name(name) for name in names):
+            if object_cls._lazy:
+                raise AvocatoError("Lazy objects need fields with identifier names")
+            return Object
+        return type(
+            "{0}Instance".format(object_cls.__name__),
+            (LazySlots if object_cls._lazy else SlotsObject,),
+            {
+                "__slots__": names,
+                "__module__": object_cls.__module__,
+                # Lets pickle find the class through the object it belongs to.
+                "__qualname__": "{0}._meta_model".format(object_cls.__qualname__),
+            },
+        )
+
+    @staticmethod
+    def _compile_functions(object_cls):
+        owner = object_cls.__qualname__
+        fields = object_cls._fields
+        for name in dict.fromkeys(object_cls._field_names):
+            if name != "instance":
+                setattr(object_cls, name, compiler.compile_field_property(name, owner=owner))
+
+        populate = compiler.compile_populate(fields, owner=owner)
+        populate_new = populate
+        meta_model = object_cls._meta_model
+        # Instances created by the object itself start out empty, so there is nothing to
+        # preserve on them.
+        object_cls._fresh_model = meta_model is Object or (
+            isinstance(meta_model, type) and issubclass(meta_model, SlotsObject)
+        )
+        if object_cls._fresh_model:
+            populate_new = compiler.compile_populate(fields, fresh=True, owner=owner)
+        object_cls._new_model = meta_model
+        object_cls._materialize = None
+        if object_cls._lazy:
+            lazy_model = type(
+                meta_model.__name__,
+                (LazyObject, meta_model),
+                {
+                    "__slots__": (),
+                    "__module__": object_cls.__module__,
+                    "__qualname__": "{0}._new_model".format(object_cls.__qualname__),
+                },
+            )
+            lazy_model._loaders = {
+                field.name: compiler.compile_field_loader(meta_model, field, owner=owner)
+                for field in compiler.unique_fields(fields)
+            }
+            object_cls._new_model = lazy_model
+            object_cls._materialize = staticmethod(
+                compiler.compile_materialize(lazy_model, meta_model, fields, owner=owner)
+            )
+            populate_new = _keep_data
+        object_cls._populate_func = staticmethod(populate)
+        object_cls._populate_new_func = staticmethod(populate_new)
+        object_cls._validate_func = staticmethod(
+            compiler.compile_validate(object_cls, fields, owner=owner)
+        )
+        # Used to re-validate the fields changed since the last successful validation.
+        object_cls._field_checks = compiler.compile_field_checks(fields, owner=owner)
+        object_cls._hooks_func = staticmethod(
+            compiler.compile_hooks(object_cls, fields, owner=owner)
+        )
+        object_cls._to_dict_funcs = {
+            mode: compiler.compile_to_dict(fields, mode=mode, owner=owner)
+            for mode in ("python", "json")
+        }
+        object_cls._to_json_func = staticmethod(compiler.compile_to_json(fields, owner=owner))
+        # Functions compiled for subsets of the fields, see ``_subset_function``.
+        object_cls._compiled_subsets = OrderedDict()
+        object_cls._field_name_set = frozenset(
+            field.name for field in compiler.unique_fields(fields)
+        )
+
+        # Batch counterparts used by objects created with many=True.
+        object_cls._columns_func = staticmethod(compiler.compile_columns(fields, owner=owner))
+        object_cls._column_checks = compiler.compile_column_checks(
+            object_cls, fields, owner=owner
+        )
+        object_cls._rows_to_dicts_funcs = {
+            mode: compiler.compile_rows_to_dicts(fields, mode=mode, owner=owner)
+            for mode in ("python", "json")
+        }
+        object_cls._rows_to_json_func = staticmethod(
+            compiler.compile_rows_to_json(fields, owner=owner)
+        )
+
+        # Coroutine validators or hooks make the object validate with is_valid_async only.
+        async_checks = []
+        nested_checks = {}
+        is_async = False
+        for field in compiler.unique_fields(fields):
+            hook = compiler.resolve_hook(object_cls, field)
+            schema = compiler.nested_schema(field)
+            if schema is not None and schema._is_async:
+                raise AvocatoError(
+                    "Nested {0} {1!r} can't have asynchronous validators".format(
+                        schema.__name__, field.name
+                    )
+                )
+            if compiler.has_nested_errors(field):
+                nested_checks[field.name] = compiler.compile_nested_check(field, owner=owner)
+            if field.validators or hook is not None or field.name in nested_checks:
+                async_checks.append((field, hook))
+            is_async = is_async or any(
+                compiler.is_coroutine_check(check)
+                for check in field.validators + [hook]
+                if check is not None
+            )
+        object_cls._async_checks = async_checks
+        object_cls._nested_checks = nested_checks
+        object_cls._is_async = is_async
 
     # def __call__(cls, *args, **kwargs):
     #     obj = super().__call__(*args, **kwargs)
@@ -60,11 +363,14 @@ class AvocatoObjectMeta(type):
         for k in direct_fields.keys():
             del attrs[k]
 
-        meta_model = Object
+        meta_model = None
         if "Meta" in attrs:
             meta_model, meta_fields = cls.parse_meta_class(
                 cls, attrs["Meta"], direct_fields
             )
+            lazy = getattr(attrs["Meta"], "lazy", None)
+            if lazy is not None:
+                attrs["_lazy"] = bool(lazy)
             del attrs["Meta"]
 
         meta_fields.update(direct_fields)
@@ -74,10 +380,15 @@ class AvocatoObjectMeta(type):
 
         base_classes_fields = cls._get_fields_from_base_classes(real_cls)
 
-        real_cls._meta_model = meta_model
         all_fields = compiled_fields + base_classes_fields
         real_cls._fields = all_fields
         real_cls._field_names = [field.name for field in all_fields]
+        if meta_model is None:
+            meta_model = cls._make_meta_model(real_cls, real_cls._field_names)
+        elif real_cls._lazy:
+            raise AvocatoError("Lazy objects can't have a Meta.model")
+        real_cls._meta_model = meta_model
+        cls._compile_functions(real_cls)
         # real_cls.create_fields = [field for field in all_fields if field.is_create_field]
         # real_cls.update_fields = [field for field in all_fields if field.is_update_field]
         return real_cls
@@ -104,12 +415,36 @@ class AvocatoObject(Field, metaclass=AvocatoObjectMeta):
         obj = MyObject()
         FooObject(obj).data
         # {'bar': 2, 'baz': 'hello'}
+
+    With ``lazy = True`` in the ``Meta`` class, creating an object only keeps a reference to the
+    input data. Each field is loaded from it the first time it is read, and the remaining ones
+    are loaded before validation. Lazy objects can't have a ``Meta.model``.
     """
 
     _fields = []
     # create_fields = []
     # update_fields = []
     _validation_successful = False
+    # Set by ``Meta.lazy``: instances load fields from the input data on first access.
+    _lazy = False
+    # Fields set since the object was created (or ``clear_changed_fields``) and since the last
+    # successful validation. Both are created on the first change.
+    _changed = None
+    _unvalidated = None
+    # Whether all fields but the ``_unvalidated`` ones passed validation.
+    _validated = False
+    # Names of the fields checked by the last ``is_valid(only=..., exclude=...)``, None if it
+    # checked all of them. Only these fields can be serialized.
+    _validated_names = None
+
+    #: How many functions compiled for subsets of the fields (e.g. for ``only=`` projections)
+    #: each class keeps. The least recently used one is dropped when there are more.
+    compiled_subsets_size = 32
+
+    #: Whether :meth:`to_json` and :meth:`to_json_bytes` encode with orjson if it is installed.
+    #: orjson writes NaN and infinities as ``null`` and raises ``TypeError`` for ints outside the
+    #: 64-bit range, where the compiled encoder writes them like :func:`json.dumps`.
+    use_orjson = False
 
     #: The default getter used if :meth:`Field.as_getter` returns None.
     # _default_getter = operator.attrgetter
@@ -118,45 +453,209 @@ class AvocatoObject(Field, metaclass=AvocatoObjectMeta):
         """
         :param object instance: instance which we want to serialize. Note that this instance will
                                 get directly modified
+        :param bool many: Whether ``data`` is a list of mappings that should be validated as a
+                          batch. Batches are kept as columns and have no instance.
         """
         super().__init__(**kwargs)
-        self.instance = instance or self._meta_model()
         self._data = data
         self._many = many
         self.serialized_data = None
         self.errors = {}
 
-        self._populate_instance()
-
-    def __getattribute__(self, name):
-        if name not in {"_field_names", "instance"} and name in self._field_names:
-            return getattr(self.instance, name)
+        if many:
+            if instance:
+                raise AvocatoError("Passing an instance with many=True is not supported")
+            self.instance = None
+            self._load_many(data)
+        elif instance:
+            self.instance = instance
+            self._populate_func(instance, data)
         else:
-            return super().__getattribute__(name)
+            self.instance = instance = self._new_model()
+            self._populate_new_func(instance, data)
 
-    def __setattr__(self, name, value):
-        if name in self._field_names:
-            setattr(self.instance, name, value)
+    def _load_many(self, data):
+        if not isinstance(data, (list, tuple)):
+            data = list(data or ())
+        self._data = data
+        self._columns = self._columns_func(data)
+        self._validation_successful = False
+        self.errors = {}
+
+    @classmethod
+    def from_json(cls, data, many=False, loads=None, **kwargs):
+        """Creates an object from a JSON document.
+
+        :param data: JSON text as bytes or str. It must hold an object, or an array of objects
+            with ``many=True``.
+        :param loads: Function used to decode ``data``. Defaults to ``orjson.loads`` if orjson is
+            installed and :func:`json.loads` otherwise.
+
+        Other keyword arguments are passed to the constructor. Raises ``ValueError`` if ``data``
+        isn't valid JSON and :class:`~avocato.exceptions.AvocatoError` if it has the wrong shape.
+        """
+        return cls._from_decoded((loads or _json_loads)(data), many, kwargs)
+
+    @classmethod
+    def from_msgpack(cls, data, many=False, **kwargs):
+        """Creates an object from MessagePack ``data``, e.g. written by :meth:`to_msgpack`.
+
+        Works like :meth:`from_json`, see :mod:`avocato.vendors.msgpack` for the extension types
+        that are decoded. Requires the ``msgpack`` package.
+        """
+        from .vendors.msgpack import unpackb
+
+        return cls._from_decoded(unpackb(data), many, kwargs)
+
+    @classmethod
+    def record_layout(cls):
+        """Returns the :class:`~avocato.records.RecordLayout` of the class, built on first use.
+        """
+        layout = cls.__dict__.get("_record_layout")
+        if layout is None:
+            layout = records.RecordLayout(compiler.unique_fields(cls._fields))
+            cls._record_layout = layout
+        return layout
+
+    @classmethod
+    def unpack(cls, buffer, many=False, **kwargs):
+        """Creates an object from fixed-width binary records written by :meth:`pack`.
+
+        ``buffer`` holds one record, or any number of them with ``many=True``. Other keyword
+        arguments are passed to the constructor.
+        """
+        layout = cls.record_layout()
+        keys = [field._key for field in layout.fields]
+        if many:
+            data = [dict(zip(keys, row)) for row in layout.iter_unpack(buffer)]
         else:
-            super().__setattr__(name, value)
+            data = dict(zip(keys, layout.unpack(buffer)))
+        return cls(data, many=many, **kwargs)
 
-    def _populate_instance(self):
-        for field in self._fields:
-            value = None
-            if self._data:
-                try:
-                    value = field._getter(self._data)
-                except KeyError:
-                    # field value is missing from _data, so use the default one that is set at the start
-                    pass
+    @classmethod
+    def iter_unpack(cls, buffer):
+        """Lazily yields the records in ``buffer`` as dicts keyed by field labels.
 
-            if value is None and self.instance is not None:
-                value = getattr(self.instance, field.name, None)
+        ``buffer`` may be a ``memoryview`` or ``mmap`` of a file written by :meth:`pack`; records
+        are decoded one at a time without copying the buffer.
+        """
+        return cls.record_layout().iter_unpack(buffer, as_dict=True)
+
+    @classmethod
+    def _from_decoded(cls, decoded, many, kwargs):
+        if many:
+            if not isinstance(decoded, list):
+                raise AvocatoError("Expected an array, got {0}".format(type(decoded).__name__))
+        elif not isinstance(decoded, dict):
+            raise AvocatoError("Expected a map, got {0}".format(type(decoded).__name__))
+        return cls(decoded, many=many, **kwargs)
+
+    @classmethod
+    def iter_validate(cls, source, chunk_size=1000):
+        """Validates a stream of records and lazily yields the result for each of them.
+
+        :param source: An iterable of mappings or a binary file object with one JSON document
+            per line (NDJSON). Blank lines are skipped.
+        :param int chunk_size: Number of records validated together as a ``many=True`` batch.
+            Only one chunk is held in memory at a time.
+
+        Yields ``(index, valid_data, errors)`` tuples in input order, where ``valid_data`` is the
+        record as a dict keyed by field labels if it is valid and ``errors`` is its error dict
+        otherwise; the other item is ``None``.
+        """
+        if hasattr(source, "read"):
+            source = (_json_loads(line) for line in source if line.strip())
 
-            if value is None:
-                value = field.default
+        batch = cls((), many=True)
+        buffer = []
+        offset = 0
+        for record in source:
+            buffer.append(record)
+            if len(buffer) >= chunk_size:
+                yield from batch._iter_results(buffer, offset)
+                offset += len(buffer)
+                buffer.clear()
+        if buffer:
+            yield from batch._iter_results(buffer, offset)
 
-            setattr(self.instance, field.name, value)
+    @classmethod
+    def validate_many(cls, records, workers=None, chunk_size=None):
+        """Validates ``records`` as a batch, optionally spread across worker processes.
+
+        :param records: An iterable of mappings.
+        :param int workers: Number of worker processes. With ``None`` or ``1`` the records are
+            validated in the current process. Worker processes import the object class by
+            reference, so it has to be defined at module level.
+        :param int chunk_size: Number of records sent to a worker at once. Defaults to splitting
+            the records into four chunks per worker. At most two chunks per worker are handed
+            over at a time, the next ones are sent as results come in.
+
+        Returns a ``(valid_data, errors)`` tuple like the attributes of a ``many=True`` object:
+        the valid rows in input order and a dict mapping input indexes to errors.
+        """
+        if not isinstance(records, (list, tuple)):
+            records = list(records)
+        if not workers or workers == 1:
+            batch = cls(records, many=True)
+            batch.is_valid()
+            return batch.valid_data, batch.errors
+
+        schema = (cls.__module__, cls.__qualname__)
+        try:
+            importable = _import_object_class(*schema) is cls
+        except (ImportError, AttributeError):
+            importable = False
+        if not importable:
+            raise AvocatoError(
+                "{0} must be defined at module level to be validated in worker processes".format(
+                    cls.__qualname__
+                )
+            )
+
+        if chunk_size is None:
+            chunk_size = max(1, -(-len(records) // (workers * 4)))
+        in_flight = 2 * workers
+
+        valid_data = []
+        errors = {}
+        pending = deque()
+
+        def collect():
+            offset, future = pending.popleft()
+            chunk_valid_data, chunk_errors = future.result()
+            valid_data.extend(chunk_valid_data)
+            for index, row_errors in chunk_errors.items():
+                errors[index + offset] = row_errors
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for offset in range(0, len(records), chunk_size):
+                chunk = records[offset:offset + chunk_size]
+                pending.append((offset, _submit_chunk(executor, schema, chunk)))
+                if len(pending) >= in_flight:
+                    collect()
+            while pending:
+                collect()
+        return valid_data, errors
+
+    def _iter_results(self, rows, offset):
+        self._load_many(rows)
+        if self.is_valid():
+            valid_data = self._rows_to_dicts_funcs["python"](self._columns)
+            for index, row in enumerate(valid_data, offset):
+                yield index, row, None
+            return
+
+        errors = self._errors
+        valid_data = iter(self.valid_data)
+        for index in range(len(rows)):
+            row_errors = errors.get(index)
+            if row_errors is None:
+                yield index + offset, next(valid_data), None
+            else:
+                yield index + offset, None, render_messages(row_errors)
+
+    def _populate_instance(self):
+        self._populate_func(self.instance, self._data)
 
     # def _serialize(self, instance, fields):
     #     v = {}
@@ -241,80 +740,384 @@ class AvocatoObject(Field, metaclass=AvocatoObjectMeta):
     # #     return self._populate_instance(obj, self._initial_data)
 
     def _validate(self):
-        errors = defaultdict(list)
-        for field in self._fields:
-            field_value = getattr(self.instance, field.name)
-            # Loop trough all validators on field and executed them
-            if field.validators:
-                for validator in field.validators:
-                    try:
-                        validator(field_value)
-                    except AvocatoValidationError as e:
-                        errors[field.name] += e.messages
-                        break
-
-            # Call validate_<field> if it exist to get field specific errors
-            try:
-                validate_func = getattr(self, "validate_{0}".format(field.name))
-            except AttributeError:
-                pass
-            else:
-                try:
-                    validate_func(field_value)
-                except AvocatoValidationError as e:
-                    errors[field.name] += e.messages
-
-        # # Call validate to get generic serializer errors
-        # try:
-        #     self.validate(self.instance)
-        # except AvocatoValidationError as e:
-        #     errors['generic'] += e.messages
+        return self._validate_func(self, self.instance) or {}
 
-        return dict(errors)
+    def _validate_many(self, names=None):
+        errors = {}
+        columns = self._columns
+        for index, field, check_validators, check_hook in self._column_checks:
+            if names is not None and field.name not in names:
+                continue
+            column = columns[index]
+            if check_validators is not None:
+                failures = None
+                if numpy_backend is not None and len(column) >= numpy_backend.MIN_ROWS:
+                    failures = numpy_backend.check_column(field, column)
+                if failures is None:
+                    check_validators(column, errors)
+                else:
+                    for row, messages in failures.items():
+                        errors.setdefault(row, {})[field.name] = messages
+            if check_hook is not None:
+                check_hook(self, column, errors)
+        return dict(sorted(errors.items()))
 
-    def is_valid(self):
+    def is_valid(self, full=False, only=None, exclude=None):
         """Checks wether data passes validation.
 
         Returns True if all validations were successful on all fields, otherwise returns False.
+        With ``many=True``, :attr:`errors` maps indexes of invalid rows to their errors and
+        :attr:`valid_data` holds the rows that passed.
+
+        Once an object has passed validation, later calls only run the validators of the fields
+        set through the object since then. All ``validate_<field>`` hooks still run, as they may
+        read other fields. Changes made on :attr:`instance` directly or inside nested values
+        aren't tracked; pass ``full=True`` to check every field.
+
+        :param only: Names of the fields to check, see :meth:`to_dict`. Afterwards only these
+            fields can be serialized.
+        :param exclude: Names of the fields not to check.
         """
+        names = self._projection(only, exclude)
+        if self._is_async:
+            raise AvocatoError(
+                "{0} has asynchronous validators, use `.is_valid_async()`".format(
+                    type(self).__name__
+                )
+            )
         if self._many:
+            self.errors = self._validate_many(names)
+        elif self._validated and not full and names is None:
+            self.errors = self._validate_changes()
+        else:
+            if self._materialize is not None:
+                self._materialize(self.instance)
+            if names is None:
+                validate = self._validate_func
+            else:
+                validate = self._subset_function("validate", names)
+            self.errors = validate(self, self.instance) or {}
+        return self._set_validation_result(names)
+
+    def _validate_changes(self):
+        unvalidated = self._unvalidated
+        if not unvalidated:
+            return {}
+        instance = self.instance
+        errors = None
+        field_checks = self._field_checks
+        for name in unvalidated:
+            check = field_checks.get(name)
+            if check is not None:
+                errors = check(instance, errors)
+        # Hooks may read any field, so they all run.
+        return self._hooks_func(self, instance, errors) or {}
+
+    @classmethod
+    def _subset_function(cls, kind, names):
+        """Returns the ``kind`` function compiled for the fields in the frozenset ``names``.
+
+        Functions are kept in a per-class LRU cache of :attr:`compiled_subsets_size` entries.
+        The generated source of evicted functions is removed from :mod:`linecache`.
+        """
+        cache = cls._compiled_subsets
+        key = (kind, names)
+        try:
+            function, _ = cache[key]
+        except KeyError:
+            pass
+        else:
+            try:
+                cache.move_to_end(key)
+            except KeyError:
+                pass
+            return function
+
+        with compiler.collect_sources() as filenames:
+            function = cls._compile_subset(kind, names)
+        cache[key] = (function, filenames)
+        while len(cache) > cls.compiled_subsets_size:
+            try:
+                _, (_, evicted) = cache.popitem(last=False)
+            except KeyError:
+                break
+            compiler.release_sources(evicted)
+        return function
+
+    @classmethod
+    def _compile_subset(cls, kind, names):
+        fields = [field for field in compiler.unique_fields(cls._fields) if field.name in names]
+        owner = cls.__qualname__
+        if kind == "validate":
+            function = compiler.compile_validate(cls, fields, owner=owner)
+        elif kind in ("to_dict", "to_dict_json"):
+            mode = "json" if kind == "to_dict_json" else "python"
+            function = compiler.compile_to_dict(fields, mode=mode, owner=owner)
+        elif kind == "to_json":
+            function = compiler.compile_to_json(fields, owner=owner)
+        elif kind in ("rows_to_dicts", "rows_to_dicts_json"):
+            # Columns are indexed by all fields, so the rows functions pick theirs by name.
+            mode = "json" if kind == "rows_to_dicts_json" else "python"
+            function = compiler.compile_rows_to_dicts(
+                cls._fields, mode=mode, names=names, owner=owner
+            )
+        elif kind == "rows_to_json":
+            function = compiler.compile_rows_to_json(cls._fields, names=names, owner=owner)
+        else:
+            raise AvocatoError("Unknown kind of function {0!r}".format(kind))
+        return function
+
+    @classmethod
+    def _projection(cls, only, exclude):
+        """Returns the frozenset of field names selected by ``only`` and ``exclude``, or None
+        if they select every field.
+        """
+        if only is None and exclude is None:
+            return None
+        all_names = cls._field_name_set
+        names = all_names if only is None else frozenset(only)
+        excluded = frozenset(exclude or ())
+        if not (names <= all_names and excluded <= all_names):
+            unknown = (names | excluded) - all_names
+            raise ValueError(
+                "Unknown fields {0} for {1}".format(
+                    ", ".join(map(repr, sorted(unknown))), cls.__name__
+                )
+            )
+        names -= excluded
+        return None if names == all_names else names
+
+    def _check_validated(self, names):
+        if not self._validation_successful:
+            raise AvocatoError("Data is invalid or `.is_valid()` has not been run")
+        self._check_validated_names(names)
+
+    def _check_validated_names(self, names):
+        validated_names = self._validated_names
+        if validated_names is not None and (names is None or not names <= validated_names):
             raise AvocatoError(
-                "Validating an object with many=True is not supported"
+                "Only fields checked by `.is_valid()` can be serialized: {0}".format(
+                    ", ".join(sorted(validated_names))
+                )
             )
 
-        self.errors = self._validate()
-        if self.errors:
+    @property
+    def changed_fields(self):
+        """Names of the fields set through the object since it was created or since the last
+        :meth:`clear_changed_fields` call, as a frozenset.
+        """
+        return frozenset(self._changed or ())
+
+    def clear_changed_fields(self):
+        """Empties :attr:`changed_fields`, e.g. after the changes have been written.
+        """
+        self._changed = None
+
+    @property
+    def errors(self):
+        """Errors found by the last validation, keyed by field name (or by row index with
+        ``many=True``).
+
+        Validators record failures without formatting them; messages are rendered the first
+        time this attribute is read.
+        """
+        if self._rendered_errors is None:
+            self._rendered_errors = render_messages(self._errors)
+        return self._rendered_errors
+
+    @errors.setter
+    def errors(self, errors):
+        self._errors = errors
+        self._rendered_errors = None
+
+    def _set_validation_result(self, names=None):
+        self._validated_names = names
+        if self._errors:
             self._validation_successful = False
             return False
 
         self._validation_successful = True
+        if names is None:
+            self._validated = True
+            self._unvalidated = None
         return True
 
-    def to_dict(self):
-        if not self._validation_successful:
-            raise AvocatoError("Data is invalid or `.is_valid()` has not been run")
-        data = {}
-        for field in self._fields:
-            data[field.label or field.name] = getattr(self.instance, field.name)
-            # if field.getter_takes_serializer:
-            #     result = field._getter(self, instance)
-            # else:
-            #     try:
-            #         result = field._getter(instance)
-            #         if field.call:
-            #             result = result()
-            #     except (KeyError, AttributeError):
-            #         if field.required:
-            #             raise AvocatoError('Field {} is required'.format(field._name))
-            #         else:
-            #             continue
-
-            #     if field.required and result is None:
-            #         raise AvocatoError(
-            #             "Field {} is required, but it's value is None".format(field._name)
-            #         )
-
-            #     if result is not None:
-            #         result = field.to_value(result)
-            # v[field._name] = result
-        return data
+    async def is_valid_async(self, only=None, exclude=None):
+        """Asynchronous version of :meth:`is_valid`.
+
+        Validators and ``validate_<field>`` hooks may be coroutine functions. Each field's checks
+        run in order like in :meth:`is_valid`, while different fields are checked concurrently.
+        Objects without asynchronous checks are validated synchronously.
+        """
+        if not self._is_async:
+            return self.is_valid(only=only, exclude=exclude)
+        if self._many:
+            raise AvocatoError("Asynchronous validation with many=True is not supported")
+
+        names = self._projection(only, exclude)
+        instance = self.instance
+        if self._materialize is not None:
+            self._materialize(instance)
+        checks = self._async_checks
+        if names is not None:
+            checks = [(field, hook) for field, hook in checks if field.name in names]
+        results = await asyncio.gather(*[
+            self._validate_field_async(field, hook, getattr(instance, field.name))
+            for field, hook in checks
+        ])
+        self.errors = {
+            field.name: messages
+            for (field, _), messages in zip(checks, results)
+            if messages is not None
+        }
+        return self._set_validation_result(names)
+
+    async def _validate_field_async(self, field, hook, value):
+        messages = None
+        for validator in field.validators:
+            try:
+                result = validator(value)
+                if inspect.isawaitable(result):
+                    await result
+            except AvocatoValidationError as e:
+                messages = list(e.raw_messages)
+                break
+        else:
+            check_nested = self._nested_checks.get(field.name)
+            if check_nested is not None and value is not None:
+                nested_errors = check_nested(value)
+                if nested_errors is not None:
+                    messages = nested_errors[field.name]
+
+        if hook is not None:
+            if isinstance(hook, types.FunctionType):
+                validate_func = hook
+                args = (self, value)
+            else:
+                validate_func = getattr(self, "validate_{0}".format(field.name))
+                args = (value,)
+            try:
+                result = validate_func(*args)
+                if inspect.isawaitable(result):
+                    await result
+            except AvocatoValidationError as e:
+                if type(messages) is dict:
+                    messages.setdefault("_schema", []).extend(e.raw_messages)
+                else:
+                    messages = (messages or []) + list(e.raw_messages)
+        return messages
+
+    @property
+    def valid_data(self):
+        """List of rows that passed validation as dicts keyed by field labels.
+
+        Only available for objects created with ``many=True`` after ``is_valid`` has been run.
+        """
+        return self._rows_to_dicts_funcs["python"](self._valid_columns("valid_data"))
+
+    def _valid_columns(self, name):
+        if not self._many:
+            raise AvocatoError("{0} is only available with many=True".format(name))
+        if not self._validation_successful and not self._errors:
+            raise AvocatoError("`.is_valid()` has not been run")
+        self._check_validated_names(None)
+        columns = self._columns
+        if self._errors:
+            errors = self._errors
+            mask = [index not in errors for index in range(len(self._data))]
+            columns = [list(itertools.compress(column, mask)) for column in columns]
+        return columns
+
+    def to_array(self):
+        """Returns the rows that passed validation as a NumPy structured array.
+
+        Only available for objects created with ``many=True``. The array has one column per
+        field, named by the field label, and is filled straight from the validated columns.
+        See :func:`avocato.vendors.numpy.to_structured_array` for the supported fields.
+        """
+        from .vendors.numpy import to_structured_array
+
+        return to_structured_array(
+            compiler.unique_fields(self._fields), self._valid_columns("to_array")
+        )
+
+    def to_dict(self, mode="python", only=None, exclude=None):
+        """Returns the object's data as a dict keyed by field labels, or a list of such dicts
+        with ``many=True``.
+
+        :param str mode: ``"python"`` returns values as they are stored on the instance,
+            ``"json"`` converts them with each field's ``to_json_value``, so the result can be
+            passed directly to ``json.dumps``.
+        :param only: Names of the fields to include. Each distinct set of fields gets its own
+            function, compiled on first use and cached per class (see
+            :attr:`compiled_subsets_size`).
+        :param exclude: Names of the fields to leave out, also combined with ``only``.
+        """
+        names = self._projection(only, exclude)
+        self._check_validated(names)
+        if mode not in ("python", "json"):
+            raise ValueError("Unknown mode {0!r}, use 'python' or 'json'".format(mode))
+        if names is None:
+            if self._many:
+                return self._rows_to_dicts_funcs[mode](self._columns)
+            return self._to_dict_funcs[mode](self.instance)
+        suffix = "_json" if mode == "json" else ""
+        if self._many:
+            return self._subset_function("rows_to_dicts" + suffix, names)(self._columns)
+        return self._subset_function("to_dict" + suffix, names)(self.instance)
+
+    def to_json(self, only=None, exclude=None):
+        """Returns the object's data as compact JSON text, or a JSON array with ``many=True``.
+
+        Gives the same data as ``json.dumps(obj.to_dict(mode="json"))``. The text is written
+        straight from the instance (or columns) by a function compiled for the class. With
+        :attr:`use_orjson` set and `orjson <https://github.com/ijl/orjson>`_ installed, orjson
+        encodes it instead. ``only`` and ``exclude`` select fields like in :meth:`to_dict`.
+        """
+        if self.use_orjson and orjson is not None:
+            return self.to_json_bytes(only=only, exclude=exclude).decode("utf-8")
+        return self._encode_json(only, exclude)
+
+    def to_json_bytes(self, only=None, exclude=None):
+        """Returns :meth:`to_json` as UTF-8 encoded bytes.
+        """
+        if self.use_orjson and orjson is not None:
+            return orjson.dumps(
+                self.to_dict(mode="json", only=only, exclude=exclude),
+                option=orjson.OPT_NON_STR_KEYS,
+            )
+        return self._encode_json(only, exclude).encode("utf-8")
+
+    def pack(self):
+        """Returns the object's data as a fixed-width binary record, see :meth:`record_layout`.
+
+        With ``many=True`` returns the rows that passed validation as consecutive records.
+        """
+        layout = self.record_layout()
+        if self._many:
+            return layout.pack_rows(zip(*self._valid_columns("pack")))
+        self._check_validated(None)
+        return layout.pack([getattr(self.instance, field.name) for field in layout.fields])
+
+    def to_msgpack(self, only=None, exclude=None):
+        """Returns :meth:`to_dict` packed as MessagePack bytes.
+
+        Values keep their native MessagePack types; ``Decimal`` and ``datetime`` are packed as
+        extension types rather than the strings used for JSON. Requires the ``msgpack`` package.
+        """
+        from .vendors.msgpack import packb
+
+        return packb(self.to_dict(only=only, exclude=exclude))
+
+    def _encode_json(self, only=None, exclude=None):
+        names = self._projection(only, exclude)
+        self._check_validated(names)
+        if self._many:
+            if names is None:
+                rows_to_json = self._rows_to_json_func
+            else:
+                rows_to_json = self._subset_function("rows_to_json", names)
+            return "[{0}]".format(",".join(rows_to_json(self._columns)))
+        if names is None:
+            return self._to_json_func(self.instance)
+        return self._subset_function("to_json", names)(self.instance)
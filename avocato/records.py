@@ -0,0 +1,169 @@
+"""Fixed-width binary records for schemas with fixed-size fields.
+
+A schema made only of ``IntField``, ``FloatField``, ``BoolField``, ``StrField`` with ``max_length``
+and ``DateTimeField`` has a fixed size per record, so it maps to a :mod:`struct` format. Records
+are a fraction of the size of JSON and batches can be read straight out of a ``memoryview`` or
+:mod:`mmap` without copying.
+"""
+import struct
+from datetime import datetime, timedelta
+
+from .compiler import FunctionBuilder
+from .exceptions import AvocatoError
+from .fields import BoolField, DateTimeField, FloatField, IntField, StrField
+
+_EPOCH = datetime(1970, 1, 1)
+_MASK_FORMATS = ((8, "B"), (16, "H"), (32, "I"), (64, "Q"))
+
+
+def _pack_datetime(value):
+    if value.utcoffset() is not None:
+        raise AvocatoError("Only naive datetimes can be packed, got {0!r}".format(value))
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def _unpack_datetime(value):
+    return _EPOCH + timedelta(microseconds=value)
+
+
+class RecordLayout(object):
+    """The :mod:`struct` layout of a record of ``fields``.
+
+    A record starts with a bitmask of the fields that are ``None``, followed by one value per
+    field in schema order, little-endian and without padding:
+
+    * ``IntField`` as int64 (``q``), ``FloatField`` as double (``d``), ``BoolField`` as ``?``,
+    * ``StrField(max_length=n)`` as a uint16 byte length and ``4 * n`` bytes of UTF-8 (``H`` and
+      ``{4n}s``),
+    * ``DateTimeField`` as int64 microseconds since 1970-01-01 (``q``); only naive datetimes.
+
+    Raises :class:`~avocato.exceptions.AvocatoError` for other fields.
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        mask_format = next(
+            (fmt for bits, fmt in _MASK_FORMATS if len(fields) <= bits), None
+        )
+        if mask_format is None:
+            raise AvocatoError("Records can have at most 64 fields, got {0}".format(len(fields)))
+
+        formats = ["<", mask_format]
+        # (field, kind, position of the value in the unpacked tuple, byte capacity of strings);
+        # strings take two positions, the length and the bytes.
+        self._codecs = []
+        position = 1
+        for field in fields:
+            capacity = None
+            if isinstance(field, BoolField):
+                kind = "?"
+            elif isinstance(field, IntField):
+                kind = "q"
+            elif isinstance(field, FloatField):
+                kind = "d"
+            elif isinstance(field, StrField) and field.max_length is not None:
+                capacity = field.max_length * 4
+                if capacity > 0xFFFF:
+                    raise AvocatoError("Field {0!r} is too long for a record".format(field.name))
+                kind = "H{0}s".format(capacity)
+            elif isinstance(field, DateTimeField):
+                kind = "datetime"
+            else:
+                raise AvocatoError(
+                    "{0} {1!r} has no fixed-width binary form".format(
+                        type(field).__name__, field.name
+                    )
+                )
+            formats.append("q" if kind == "datetime" else kind)
+            self._codecs.append((field, kind, position, capacity))
+            position += 1 if capacity is None else 2
+
+        self.struct = struct.Struct("".join(formats))
+        self.format = self.struct.format
+        self.size = self.struct.size
+        self._pack = self._compile_pack()
+        self._row = self._compile_row("list")
+        self._row_dict = self._compile_row("dict")
+
+    def _compile_pack(self):
+        fb = FunctionBuilder("pack", ["row"])
+        fb.define("AvocatoError", AvocatoError)
+        fb.define("pack_datetime", _pack_datetime)
+        names = ["value{0}".format(index) for index in range(len(self._codecs))]
+        fb.emit(0, "{0}, = row".format(", ".join(names)) if names else "() = row")
+        fb.emit(0, "mask = 0")
+        values = ["mask"]
+        for bit, ((field, kind, _, capacity), name) in enumerate(zip(self._codecs, names)):
+            fb.emit(0, "if {0} is None:".format(name))
+            fb.emit(1, "mask |= {0}".format(1 << bit))
+            if capacity is not None:
+                size = "size{0}".format(bit)
+                fb.emit(1, "{0} = 0".format(size))
+                fb.emit(1, "{0} = b''".format(name))
+                fb.emit(0, "else:")
+                fb.emit(1, "{0} = {0}.encode('utf-8')".format(name))
+                fb.emit(1, "{0} = len({1})".format(size, name))
+                fb.emit(1, "if {0} > {1}:".format(size, capacity))
+                fb.emit(2, "raise AvocatoError({0!r})".format(
+                    "Value of {0!r} doesn't fit in {1} bytes".format(field.name, capacity)
+                ))
+                values += [size, name]
+                continue
+            fb.emit(1, "{0} = {1}".format(name, "False" if kind == "?" else "0"))
+            if kind == "datetime":
+                fb.emit(0, "else:")
+                fb.emit(1, "{0} = pack_datetime({0})".format(name))
+            values.append(name)
+        fb.emit(0, "return {0}({1})".format(fb.bind(self.struct.pack, "p"), ", ".join(values)))
+        return fb.build("record")
+
+    def _compile_row(self, kind_of_row):
+        fb = FunctionBuilder("row", ["values"])
+        fb.define("EPOCH", _EPOCH)
+        fb.define("timedelta", timedelta)
+        fb.emit(0, "mask = values[0]")
+        items = []
+        for bit, (field, kind, position, capacity) in enumerate(self._codecs):
+            if capacity is not None:
+                value = "values[{0}][:values[{1}]].decode('utf-8')".format(position + 1, position)
+            elif kind == "datetime":
+                value = "EPOCH + timedelta(0, 0, values[{0}])".format(position)
+            else:
+                value = "values[{0}]".format(position)
+            value = "None if mask & {0} else {1}".format(1 << bit, value)
+            if kind_of_row == "dict":
+                value = "{0!r}: {1}".format(field.label or field.name, value)
+            items.append(value)
+        if kind_of_row == "dict":
+            fb.emit(0, "return {{{0}}}".format(", ".join(items)))
+        else:
+            fb.emit(0, "return [{0}]".format(", ".join(items)))
+        return fb.build("record")
+
+    def pack(self, row):
+        """Packs a sequence of values, one per field, into a record.
+        """
+        try:
+            return self._pack(row)
+        except struct.error as e:
+            raise AvocatoError("Can't pack {0!r}: {1}".format(row, e))
+
+    def pack_rows(self, rows):
+        """Packs an iterable of rows into consecutive records.
+        """
+        return b"".join(self.pack(row) for row in rows)
+
+    def unpack(self, buffer, offset=0):
+        """Returns the values of the record at ``offset`` in ``buffer`` as a list.
+        """
+        return self._row(self.struct.unpack_from(buffer, offset))
+
+    def iter_unpack(self, buffer, as_dict=False):
+        """Lazily yields the values of every record in ``buffer``.
+
+        ``buffer`` may be ``bytes``, a ``memoryview`` or an ``mmap``; records are read in place.
+        Its size must be a multiple of :attr:`size`. Rows are lists, or dicts keyed by field
+        labels with ``as_dict``.
+        """
+        return map(self._row_dict if as_dict else self._row, self.struct.iter_unpack(buffer))
@@ -1,6 +1,7 @@
 import re
+from collections import OrderedDict
 
-from .exceptions import AvocatoValidationError
+from .exceptions import AvocatoValidationError, ValidationFailure
 
 
 class Validator(object):
@@ -18,6 +19,28 @@ class Validator(object):
     def _repr_args(self):
         return ''
 
+    def check(self, value):
+        """Returns ``None`` if ``value`` is valid, otherwise the failure, without raising.
+
+        Built-in validators implement ``check`` and raise its result from ``__call__``. For
+        validators that only implement ``__call__`` the raised exception is returned instead.
+        """
+        if type(self).__call__ is Validator.__call__:
+            raise NotImplementedError(
+                '{0} must implement check() or __call__()'.format(type(self).__name__)
+            )
+        try:
+            self(value)
+        except AvocatoValidationError as e:
+            return e
+        return None
+
+    def __call__(self, value):
+        failure = self.check(value)
+        if failure is not None:
+            raise AvocatoValidationError(failure)
+        return value
+
 
 class Required(Validator):
     """Validates if value is set.
@@ -32,14 +55,35 @@ class Required(Validator):
     def _format_error(self, value):
         return self.message
 
-    def __call__(self, value):
+    def check(self, value):
         if not value:
-            raise AvocatoValidationError(self._format_error(value))
-        return value
+            return ValidationFailure(self, value)
+        return None
+
+
+class NotEmpty(Required):
+    """Validates if value is set and has at least one item.
+
+    Checks the length instead of truthiness, so it also works for NumPy arrays, which can't be
+    converted to a bool.
+    """
+    def check(self, value):
+        if value is None:
+            return ValidationFailure(self, value)
+        try:
+            empty = len(value) == 0
+        except TypeError:
+            empty = not value
+        if empty:
+            return ValidationFailure(self, value)
+        return None
 
 
 class Email(Validator):
     """Validates if value is in valid email format
+
+    With ``cache_size`` the results of the last ``cache_size`` distinct addresses are kept, and the
+    least recently used one is evicted when the cache is full.
     """
     USER_REGEX = re.compile(
         r"(^[-!#$%&'*+/=?^`{}|~\w]+(\.[-!#$%&'*+/=?^`{}|~\w]+)*$"
@@ -56,36 +100,93 @@ class Email(Validator):
         r'(\.(25[0-5]|2[0-4]\d|[0-1]?\d?\d)){3}\]$', re.IGNORECASE | re.UNICODE,
     )
 
+    #: Plain ASCII addresses accepted by both regexes above, matched in one go.
+    SIMPLE_REGEX = re.compile(
+        r'[A-Z0-9_+-]+(?:\.[A-Z0-9_+-]+)*@'
+        r'(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}', re.IGNORECASE | re.ASCII,
+    )
+
+    ASCII_REGEX = re.compile(r'[\x00-\x7f]*\Z')
+
     default_message = 'Not a valid email address.'
 
-    def __init__(self, message=None):
+    def __init__(self, message=None, cache_size=None):
         self.message = message
+        self.cache_size = cache_size
+        self._cache = OrderedDict() if cache_size else None
 
     def _format_error(self, value):
         return (self.message or self.default_message).format(input=value)
 
-    def __call__(self, value):
-        message = self._format_error(value)
+    def check(self, value):
+        cache = self._cache
+        if cache is None:
+            return self._check(value)
+
+        try:
+            valid = cache[value]
+        except KeyError:
+            pass
+        except TypeError:
+            return self._check(value)
+        else:
+            try:
+                cache.move_to_end(value)
+            except KeyError:
+                pass
+            return None if valid else ValidationFailure(self, value)
 
+        failure = self._check(value)
+        cache[value] = failure is None
+        while len(cache) > self.cache_size:
+            try:
+                cache.popitem(last=False)
+            except KeyError:
+                break
+        return failure
+
+    def check_many(self, values):
+        """Checks a list of addresses and returns the failure (or ``None``) of each one.
+
+        Every distinct address is checked once.
+        """
+        results = {}
+        failures = []
+        for value in values:
+            try:
+                failure = results[value]
+            except KeyError:
+                failure = results[value] = self.check(value)
+            except TypeError:
+                failure = self.check(value)
+            failures.append(failure)
+        return failures
+
+    def _check(self, value):
         if not value or '@' not in value:
-            raise AvocatoValidationError(message)
+            return ValidationFailure(self, value)
+
+        if self.SIMPLE_REGEX.fullmatch(value):
+            return None
 
         user_part, domain_part = value.rsplit('@', 1)
 
         if not self.USER_REGEX.match(user_part):
-            raise AvocatoValidationError(message)
+            return ValidationFailure(self, value)
 
         if not self.DOMAIN_REGEX.match(domain_part):
-            try:
-                domain_part = domain_part.encode('idna').decode('ascii')
-            except UnicodeError:
-                pass
-            else:
-                if self.DOMAIN_REGEX.match(domain_part):
-                    return value
-            raise AvocatoValidationError(message)
+            # IDNA leaves ASCII domains unchanged, so only other domains can pass once encoded.
+            if not self.ASCII_REGEX.match(domain_part):
+                try:
+                    domain_part = domain_part.encode('idna').decode('ascii')
+                except UnicodeError:
+                    pass
+                else:
+                    if self.DOMAIN_REGEX.match(domain_part):
+                        return None
+            return ValidationFailure(self, value)
 
-        return value
+        return None
 
 
 class Length(Validator):
@@ -118,34 +219,72 @@ class Length(Validator):
             equal=self.equal,
         )
 
-    def __call__(self, value):
+    def check(self, value):
         length = len(value)
 
         if self.equal is not None:
             if length != self.equal:
-                raise AvocatoValidationError(self._format_error(value, self.message_equal))
-            return value
+                return ValidationFailure(self, value, self.message_equal)
+            return None
 
         if self.min_length is not None and length < self.min_length:
             message = self.message_min if self.max_length is None else self.message_all
-            raise AvocatoValidationError(self._format_error(value, message))
+            return ValidationFailure(self, value, message)
 
         if self.max_length is not None and length > self.max_length:
             message = self.message_max if self.min_length is None else self.message_all
-            raise AvocatoValidationError(self._format_error(value, message))
+            return ValidationFailure(self, value, message)
+
+        return None
+
+
+def _choices_text(choices, limit):
+    """Joins ``choices`` for error messages, listing at most ``limit`` of them.
+    """
+    choices = list(choices)
+    text = ', '.join(str(choice) for choice in choices[:limit])
+    if len(choices) > limit:
+        text = '{0} and {1} more'.format(text, len(choices) - limit)
+    return text
 
-        return value
 
+class ChoicesTextMixin(object):
+    """Renders ``choices_text`` of a choices validator the first time a message needs it.
+    """
+    #: Error messages list at most this many choices.
+    max_choices_text = 20
+
+    _choices_text = None
+
+    @property
+    def choices_text(self):
+        if self._choices_text is None:
+            self._choices_text = _choices_text(self.choices, self.max_choices_text)
+        return self._choices_text
+
+    @choices_text.setter
+    def choices_text(self, value):
+        self._choices_text = value
 
-class OneOf(Validator):
+
+class OneOf(ChoicesTextMixin, Validator):
     """Validates if the value is one of the choices.
+
+    Hashable choices are indexed in a frozenset, so large choice sets are checked in constant
+    time; they must hash consistently with how they compare. Choices that can't be hashed and
+    strings (which test for substrings) are searched as given.
     """
     default_message = 'Value {input} must be one of {choices}.'
 
     def __init__(self, choices, message=None):
         self.choices = choices
-        self.choices_text = ', '.join(str(choice) for choice in self.choices)
         self.message = message or self.default_message
+        self._index = None
+        if not isinstance(choices, (str, bytes)):
+            try:
+                self._index = frozenset(choices)
+            except TypeError:
+                pass
 
     def _repr_args(self):
         return 'choices={0!r}'.format(self.choices)
@@ -156,24 +295,31 @@ class OneOf(Validator):
             choices=self.choices_text,
         )
 
-    def __call__(self, value):
+    def check(self, value):
         try:
-            if value not in self.choices:
-                raise AvocatoValidationError(self._format_error(value))
+            if self._index is not None:
+                try:
+                    found = value in self._index
+                except TypeError:
+                    # Unhashable values can still compare equal to a choice.
+                    found = value in self.choices
+            else:
+                found = value in self.choices
         except TypeError:
-            raise AvocatoValidationError(self._format_error(value))
+            return ValidationFailure(self, value)
 
-        return value
+        if not found:
+            return ValidationFailure(self, value)
+        return None
 
 
-class OneOfType(Validator):
+class OneOfType(ChoicesTextMixin, Validator):
     """Validates if value type is one of the choices.
     """
     default_message = 'Value {input} of type {input_type} must be one of {choices} type'
 
     def __init__(self, choices, message=None):
         self.choices = choices
-        self.choices_text = ', '.join(str(choice) for choice in self.choices)
         self.message = message or self.default_message
 
     def _repr_args(self):
@@ -186,7 +332,7 @@ class OneOfType(Validator):
             choices=self.choices_text,
         )
 
-    def __call__(self, value):
+    def check(self, value):
         if not isinstance(value, self.choices):
-            raise AvocatoValidationError(self._format_error(value))
-        return value
+            return ValidationFailure(self, value)
+        return None
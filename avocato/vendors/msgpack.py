@@ -0,0 +1,76 @@
+import struct
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import msgpack
+
+#: Extension type holding a ``Decimal`` as its ASCII string form.
+DECIMAL_EXT = 1
+#: Extension type holding a ``datetime`` as big-endian int64 microseconds since 1970-01-01 of its
+#: wall time, followed by an int32 UTC offset in seconds for aware datetimes.
+DATETIME_EXT = 2
+#: Extension type holding an int outside the 64-bit range msgpack supports natively, as
+#: big-endian two's complement bytes.
+BIGINT_EXT = 3
+
+_EPOCH = datetime(1970, 1, 1)
+_naive = struct.Struct(">q")
+_aware = struct.Struct(">qi")
+
+
+def _microseconds(delta):
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def default(obj):
+    """Packs values msgpack has no native type for as extension types.
+
+    Arrays of ``ListField(storage=...)`` are packed as lists. msgpack also hands over ints that
+    don't fit into 64 bits.
+    """
+    if isinstance(obj, int):
+        return msgpack.ExtType(
+            BIGINT_EXT, obj.to_bytes(obj.bit_length() // 8 + 1, "big", signed=True)
+        )
+    if isinstance(obj, Decimal):
+        return msgpack.ExtType(DECIMAL_EXT, str(obj).encode("ascii"))
+    if isinstance(obj, datetime):
+        wall_time = _microseconds(obj.replace(tzinfo=None) - _EPOCH)
+        offset = obj.utcoffset()
+        if offset is None:
+            return msgpack.ExtType(DATETIME_EXT, _naive.pack(wall_time))
+        return msgpack.ExtType(
+            DATETIME_EXT, _aware.pack(wall_time, offset.days * 86400 + offset.seconds)
+        )
+    tolist = getattr(obj, "tolist", None)
+    if tolist is not None:
+        return tolist()
+    raise TypeError("Can't pack {0!r}".format(obj))
+
+
+def ext_hook(code, data):
+    """Unpacks the extension types written by :func:`default`.
+    """
+    if code == DECIMAL_EXT:
+        return Decimal(data.decode("ascii"))
+    if code == DATETIME_EXT:
+        if len(data) == _naive.size:
+            return _EPOCH + timedelta(microseconds=_naive.unpack(data)[0])
+        wall_time, offset = _aware.unpack(data)
+        value = _EPOCH + timedelta(microseconds=wall_time)
+        return value.replace(tzinfo=timezone(timedelta(seconds=offset)))
+    if code == BIGINT_EXT:
+        return int.from_bytes(data, "big", signed=True)
+    return msgpack.ExtType(code, data)
+
+
+def packb(obj):
+    """Packs ``obj`` with ``Decimal``, ``datetime`` and big int values as extension types.
+    """
+    return msgpack.packb(obj, default=default, use_bin_type=True)
+
+
+def unpackb(data):
+    """Unpacks data written by :func:`packb`.
+    """
+    return msgpack.unpackb(data, ext_hook=ext_hook, raw=False, strict_map_key=False)
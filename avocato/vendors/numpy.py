@@ -0,0 +1,263 @@
+import array
+import bisect
+
+import numpy
+
+from ..exceptions import AvocatoError
+from ..fields import BoolField, DateTimeField, FloatField, IntField, ListField, StrField
+from ..validators import OneOf, OneOfType, Required
+
+#: Columns shorter than this are cheaper to check in pure Python.
+MIN_ROWS = 256
+
+_supported_fields = (IntField, FloatField, BoolField)
+_supported_validators = {Required, OneOfType, OneOf}
+_dtypes = {int: numpy.int64, float: numpy.float64, bool: numpy.bool_}
+_array_dtypes = {"q": numpy.int64, "d": numpy.float64}
+_number_types = (int, float, bool)
+_none_type = type(None)
+
+
+def supports(field):
+    """Whether the validators of ``field`` can be checked on a NumPy array.
+    """
+    return isinstance(field, _supported_fields) and _supports_validators(field.validators)
+
+
+def _supports_validators(validators):
+    return all(type(validator) in _supported_validators for validator in validators)
+
+
+def _failure_mask(validator, values, none_mask, value_type):
+    """Returns a boolean array of rows that fail ``validator``.
+    """
+    if type(validator) is Required:
+        fails = values == 0
+        if none_mask is not None:
+            fails |= none_mask
+        return fails
+
+    if type(validator) is OneOfType:
+        fails = numpy.zeros(len(values), dtype=bool)
+        if value_type is not None and not issubclass(value_type, validator.choices):
+            fails[:] = True
+        if none_mask is not None:
+            if issubclass(_none_type, validator.choices):
+                fails &= ~none_mask
+            else:
+                fails |= none_mask
+        return fails
+
+    # OneOf
+    choices = [choice for choice in validator.choices if type(choice) in _number_types]
+    fails = ~numpy.isin(values, numpy.array(choices))
+    if none_mask is not None:
+        if None in validator.choices:
+            fails &= ~none_mask
+        else:
+            fails |= none_mask
+    return fails
+
+
+def check_column(field, column):
+    """Checks the validators of ``field`` against a whole column with NumPy.
+
+    Returns a dict mapping indexes of failing rows to their unrendered messages, or ``None`` if
+    the column can't be checked this way (e.g. values of mixed types), in which case the caller
+    falls back to checking it in Python. Arrays only narrow down the failing rows; their messages
+    come from running the validators on the original values, so they match the Python path.
+
+    For a ``ListField(of=...)`` the elements of all rows are checked as one array, see
+    :func:`check_list_column`.
+    """
+    if isinstance(field, ListField) and field.item_validators is not None:
+        return check_list_column(field, column)
+    if not supports(field):
+        return None
+    return _check_values(field.validators, column)
+
+
+def _check_values(validators, column):
+    types = set(map(type, column))
+    value_types = types - {_none_type}
+    if len(value_types) > 1 or not value_types <= set(_dtypes):
+        return None
+    value_type = value_types.pop() if value_types else None
+    dtype = _dtypes.get(value_type, numpy.int64)
+
+    none_mask = None
+    try:
+        if _none_type in types:
+            objects = numpy.array(column, dtype=object)
+            none_mask = numpy.equal(objects, None)
+            objects[none_mask] = 0
+            values = objects.astype(dtype)
+        else:
+            values = numpy.array(column, dtype=dtype)
+    except OverflowError:
+        return None
+
+    fails = numpy.zeros(len(column), dtype=bool)
+    for validator in validators:
+        fails |= _failure_mask(validator, values, none_mask, value_type)
+    indexes = numpy.flatnonzero(fails).tolist()
+    return _first_failures(validators, indexes, [column[index] for index in indexes])
+
+
+def _first_failures(validators, indexes, values):
+    """Maps each of ``indexes`` to the first failure of ``validators`` on its value.
+    """
+    failures = {}
+    for index, value in zip(indexes, values):
+        for validator in validators:
+            failure = validator.check(value)
+            if failure is not None:
+                failures[index] = [failure]
+                break
+    return failures
+
+
+def _typed_array(value):
+    """Returns ``value`` as an int64 or float64 NumPy array without copying, or ``None``.
+    """
+    if isinstance(value, numpy.ndarray):
+        if value.ndim == 1 and value.dtype in (numpy.int64, numpy.float64):
+            return value
+        return None
+    if isinstance(value, array.array) and value.typecode in _array_dtypes:
+        return numpy.frombuffer(value, dtype=_array_dtypes[value.typecode])
+    return None
+
+
+def check_list_column(field, column):
+    """Checks a column of a ``ListField(of=...)``, with the elements of every row in one array.
+
+    The validators of the field itself run on each row in Python. Elements of invalid rows are
+    not checked. Failing rows map to their messages, or to a dict of messages per element index.
+    Rows stored as arrays (see ``ListField(storage=...)``) are concatenated as they are, other
+    rows are converted like :func:`check_column` does. Returns ``None`` if the element
+    validators or types aren't supported.
+    """
+    validators = field.item_validators
+    if not _supports_validators(validators):
+        return None
+
+    failures = {}
+    rows = []
+    starts = []
+    pieces = []
+    size = 0
+    for row, value in enumerate(column):
+        for validator in field.validators:
+            failure = validator.check(value)
+            if failure is not None:
+                failures[row] = [failure]
+                break
+        else:
+            if value is None:
+                continue
+            items = _typed_array(value)
+            if items is None:
+                items = ListField.items(value)
+                if items is None:
+                    failures[row] = [ListField.sequence_type.check(value)]
+                    continue
+            if len(items):
+                rows.append(row)
+                starts.append(size)
+                pieces.append(items)
+                size += len(items)
+
+    dtypes = {getattr(piece, "dtype", None) for piece in pieces}
+    if len(dtypes) == 1 and None not in dtypes:
+        values = numpy.concatenate(pieces)
+        value_type = int if values.dtype == numpy.int64 else float
+        fails = numpy.zeros(len(values), dtype=bool)
+        for validator in validators:
+            fails |= _failure_mask(validator, values, None, value_type)
+        indexes = numpy.flatnonzero(fails)
+        element_failures = _first_failures(
+            validators, indexes.tolist(), values[indexes].tolist()
+        )
+    else:
+        elements = []
+        for piece in pieces:
+            elements.extend(piece.tolist() if isinstance(piece, numpy.ndarray) else piece)
+        element_failures = _check_values(validators, elements)
+        if element_failures is None:
+            return None
+
+    for index, messages in element_failures.items():
+        position = bisect.bisect_right(starts, index) - 1
+        row_failures = failures.setdefault(rows[position], {})
+        row_failures[index - starts[position]] = messages
+    return dict(sorted(failures.items()))
+
+
+def array_converter(typecode):
+    """Returns a function converting a list to a NumPy array of the :mod:`array` ``typecode``.
+
+    Values go through :class:`array.array` first, which rejects values that don't fit instead
+    of wrapping them like NumPy does, then the array is used as the NumPy buffer.
+    """
+    dtype = _array_dtypes[typecode]
+
+    def to_array(values):
+        return numpy.frombuffer(array.array(typecode, values), dtype=dtype)
+
+    return to_array
+
+
+def field_dtype(field):
+    """Returns the NumPy dtype used to store values of ``field`` in a structured array.
+    """
+    if isinstance(field, BoolField):
+        return numpy.dtype(numpy.bool_)
+    if isinstance(field, IntField):
+        return numpy.dtype(numpy.int64)
+    if isinstance(field, FloatField):
+        return numpy.dtype(numpy.float64)
+    if isinstance(field, StrField) and field.max_length is not None:
+        return numpy.dtype("U{0}".format(field.max_length))
+    if isinstance(field, DateTimeField):
+        return numpy.dtype("datetime64[us]")
+    raise AvocatoError(
+        "{0} {1!r} can't be stored in a structured array".format(type(field).__name__, field.name)
+    )
+
+
+def to_structured_array(fields, columns):
+    """Builds a structured array from validated ``columns`` of ``fields``.
+
+    ``IntField`` is stored as int64, ``FloatField`` as float64, ``BoolField`` as bool,
+    ``StrField`` with ``max_length`` as fixed-width unicode and ``DateTimeField`` as
+    datetime64[us]. Missing values become ``NaN``/``NaT`` for floats and datetimes and empty
+    strings for ``StrField``; integer and bool columns can't hold them and raise
+    :class:`~avocato.exceptions.AvocatoError`. So do timezone-aware datetimes, as datetime64
+    has no timezone.
+    """
+    dtype = numpy.dtype(
+        [(field.label or field.name, field_dtype(field)) for field in fields]
+    )
+    size = len(columns[0]) if columns else 0
+    array = numpy.empty(size, dtype=dtype)
+    for field, column in zip(fields, columns):
+        name = field.label or field.name
+        kind = dtype[name].kind
+        if kind in "biU" and None in column:
+            if kind != "U":
+                raise AvocatoError(
+                    "Field {0!r} has missing values, which {1} can't hold".format(
+                        field.name, dtype[name]
+                    )
+                )
+            column = ["" if value is None else value for value in column]
+        elif kind == "M":
+            for value in column:
+                if value is not None and value.utcoffset() is not None:
+                    raise AvocatoError(
+                        "Field {0!r} has a timezone-aware datetime {1!r}, only naive "
+                        "datetimes can be stored".format(field.name, value)
+                    )
+        array[name] = column
+    return array
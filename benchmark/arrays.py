@@ -0,0 +1,46 @@
+from datetime import datetime
+from pprint import pprint
+
+import numpy
+
+from utils import benchmark_callables
+
+import avocato
+
+
+class RecordObject(avocato.AvocatoObject):
+    id = avocato.IntField()
+    score = avocato.FloatField()
+    active = avocato.BoolField()
+    code = avocato.StrField(max_length=8)
+    created_at = avocato.DateTimeField()
+
+
+def via_dicts(objs, dtype):
+    """Converting ``to_dict`` output, what callers had to do before ``to_array``.
+    """
+    rows = objs.to_dict()
+    return numpy.array([tuple(row.values()) for row in rows], dtype=dtype)
+
+
+if __name__ == '__main__':
+    num_rows = 100000
+    rows = [
+        {
+            'id': i + 1,
+            'score': i / 3 + 0.5,
+            'active': True,
+            'code': 'C{0}'.format(i % 1000),
+            'created_at': datetime(2019, 1, 1, i % 24),
+        }
+        for i in range(num_rows)
+    ]
+    objs = RecordObject(rows, many=True)
+    assert objs.is_valid()
+
+    dtype = objs.to_array().dtype
+
+    pprint(benchmark_callables([
+        ('to_dict + numpy.array', lambda: via_dicts(objs, dtype)),
+        ('to_array', objs.to_array),
+    ], 1, repetitions=5))
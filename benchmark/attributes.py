@@ -0,0 +1,49 @@
+from pprint import pprint
+
+from utils import benchmark_callables, make_object_class
+
+import avocato
+
+
+class LegacyProxyMixin(object):
+    """The attribute proxy ``AvocatoObject`` used before fields became descriptors.
+    """
+
+    def __getattribute__(self, name):
+        if name not in {'_field_names', 'instance'} and name in self._field_names:
+            return getattr(self.instance, name)
+        else:
+            return super().__getattribute__(name)
+
+    def __setattr__(self, name, value):
+        if name in self._field_names:
+            setattr(self.instance, name, value)
+        else:
+            super().__setattr__(name, value)
+
+
+if __name__ == '__main__':
+    results = {}
+    for num_fields in (5, 50, 500):
+        object_cls = make_object_class(num_fields, lambda i: avocato.IntField(default=i))
+        legacy_cls = type('Legacy{0}'.format(num_fields), (LegacyProxyMixin, object_cls), {})
+        obj = object_cls()
+        legacy = legacy_cls()
+        # The last field is the worst case for the legacy list scan.
+        name = 'f{0}'.format(num_fields - 1)
+
+        def write(obj=obj):
+            setattr(obj, name, 1)
+
+        def legacy_write(obj=legacy):
+            setattr(obj, name, 1)
+
+        results[num_fields] = benchmark_callables([
+            ('legacy read', lambda: getattr(legacy, name)),
+            ('descriptor read', lambda: getattr(obj, name)),
+            ('legacy write', legacy_write),
+            ('descriptor write', write),
+            ('legacy internal read', lambda: legacy._fields),
+            ('internal read', lambda: obj._fields),
+        ], 100000)
+    pprint(results)
@@ -0,0 +1,62 @@
+from pprint import pprint
+
+from utils import benchmark_callables
+
+import avocato
+from avocato import objects
+
+
+class FooObject(avocato.AvocatoObject):
+    id = avocato.IntField()
+    name = avocato.StrField(max_length=20)
+    count = avocato.IntField()
+    code = avocato.StrField()
+
+
+class NumbersObject(avocato.AvocatoObject):
+    id = avocato.IntField()
+    score = avocato.FloatField()
+    active = avocato.BoolField()
+    level = avocato.IntField(validators=[avocato.OneOf(list(range(1, 11)))])
+
+
+def one_by_one(rows):
+    return [FooObject(row).is_valid() for row in rows]
+
+
+def batch(rows, object_cls=FooObject):
+    objs = object_cls(rows, many=True)
+    objs.is_valid()
+    return objs.valid_data
+
+
+def batch_without_numpy(rows, object_cls):
+    backend = objects.numpy_backend
+    objects.numpy_backend = None
+    try:
+        return batch(rows, object_cls)
+    finally:
+        objects.numpy_backend = backend
+
+
+if __name__ == '__main__':
+    num_rows = 100000
+    rows = [
+        {'id': i + 1, 'name': 'name {0}'.format(i), 'count': i % 7 + 1, 'code': 'AB'}
+        for i in range(num_rows)
+    ]
+
+    number_rows = [
+        {'id': i + 1, 'score': i / 3 + 0.5, 'active': True, 'level': i % 10 + 1}
+        for i in range(num_rows)
+    ]
+
+    results = benchmark_callables([
+        ('object per row', lambda: one_by_one(rows)),
+        ('many=True', lambda: batch(rows)),
+        ('numbers, pure Python', lambda: batch_without_numpy(number_rows, NumbersObject)),
+        ('numbers, NumPy', lambda: batch(number_rows, NumbersObject)),
+    ], 1, repetitions=5)
+    for result in results.values():
+        result['Rows/s'] = num_rows * result['Calls/s']
+    pprint(results)
@@ -0,0 +1,34 @@
+import random
+from pprint import pprint
+
+from utils import benchmark_callables
+
+from avocato.validators import Email
+
+
+def address_corpus(size=10000, distinct=1500, seed=0):
+    """Signup-like traffic: a few thousand users sending repeated events, some with typos.
+    """
+    rng = random.Random(seed)
+    names = ['spongebob', 'patrick.star', 'sandy_cheeks', 'eugene+krabs', 'squidward', 'plankton']
+    domains = ['bikini.bottom', 'krusty-krab.com', 'chum.bucket', 'treedome.tx', 'münchen.de']
+    addresses = []
+    for i in range(distinct):
+        address = '{0}{1}@{2}'.format(rng.choice(names), i, rng.choice(domains))
+        if rng.random() < 0.05:
+            address = address.replace('@', '', 1)
+        addresses.append(address)
+    # Popular addresses repeat much more often than the rest.
+    return [addresses[int(rng.paretovariate(1.2)) % distinct] for _ in range(size)]
+
+
+if __name__ == '__main__':
+    corpus = address_corpus()
+    plain = Email()
+    cached = Email(cache_size=1024)
+
+    pprint(benchmark_callables([
+        ('check', lambda: [plain.check(address) for address in corpus]),
+        ('check, cache_size=1024', lambda: [cached.check(address) for address in corpus]),
+        ('check_many', lambda: plain.check_many(corpus)),
+    ], 10))
@@ -0,0 +1,47 @@
+from pprint import pprint
+
+from utils import benchmark_callables
+
+import avocato
+
+
+class FooObject(avocato.AvocatoObject):
+    foo = avocato.StrField(max_length=10)
+    bar = avocato.IntField()
+    w = avocato.FloatField()
+    email = avocato.EmailField()
+    y = avocato.StrField(choices=['a', 'b', 'c'])
+
+
+def raising_validate(obj):
+    """Validation through the raising protocol, as the compiled loop did before ``check``.
+    """
+    errors = None
+    instance = obj.instance
+    for field in obj._fields:
+        value = getattr(instance, field.name)
+        try:
+            for validator in field.validators:
+                validator(value)
+        except avocato.AvocatoValidationError as e:
+            if errors is None:
+                errors = {}
+            errors[field.name] = list(e.raw_messages)
+    return errors
+
+
+def traffic(failure_rate, size=1000):
+    valid = {'foo': 'bar', 'bar': 5, 'w': 1.5, 'email': 'bob@bikini.bottom', 'y': 'a'}
+    invalid = {'foo': 'barbarbarbar', 'bar': '5', 'w': 1, 'email': 'bob', 'y': 'd'}
+    rejected = int(size * failure_rate)
+    return [FooObject(invalid if i < rejected else valid) for i in range(size)]
+
+
+if __name__ == '__main__':
+    for failure_rate in (0, 0.1, 0.5):
+        objects = traffic(failure_rate)
+        print('{0:.0%} invalid'.format(failure_rate))
+        pprint(benchmark_callables([
+            ('raising', lambda: [raising_validate(obj) for obj in objects]),
+            ('check', lambda: [obj._validate() for obj in objects]),
+        ], 100))
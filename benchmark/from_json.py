@@ -0,0 +1,43 @@
+import json
+from pprint import pprint
+
+from utils import benchmark_callables
+
+import avocato
+from avocato import objects
+
+
+class EventObject(avocato.AvocatoObject):
+    id = avocato.IntField()
+    kind = avocato.StrField()
+    user = avocato.StrField()
+    amount = avocato.FloatField(required=False)
+
+
+def wide_payload(extra_keys=200):
+    """An event carrying a few schema fields and a lot of keys the schema ignores.
+    """
+    payload = {'id': 1, 'kind': 'signup', 'user': 'spongebob', 'amount': 1.5}
+    for i in range(extra_keys):
+        payload['attribute_{0}'.format(i)] = {'value': 'x' * 20, 'weight': i}
+    return json.dumps(payload).encode()
+
+
+if __name__ == '__main__':
+    payload = wide_payload()
+    batch = b'[' + b','.join([payload] * 100) + b']'
+
+    orjson = objects.orjson
+    objects.orjson = None
+    pprint(benchmark_callables([
+        ('json.loads + constructor', lambda: EventObject(json.loads(payload.decode()))),
+        ('from_json (json)', lambda: EventObject.from_json(payload)),
+        ('many: from_json (json)', lambda: EventObject.from_json(batch, many=True)),
+    ], 200))
+
+    if orjson is not None:
+        objects.orjson = orjson
+        pprint(benchmark_callables([
+            ('from_json (orjson)', lambda: EventObject.from_json(payload)),
+            ('many: from_json (orjson)', lambda: EventObject.from_json(batch, many=True)),
+        ], 200))
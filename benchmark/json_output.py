@@ -0,0 +1,55 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+from pprint import pprint
+
+from utils import benchmark_callables
+
+import avocato
+from avocato import objects
+
+
+class OrderObject(avocato.AvocatoObject):
+    id = avocato.IntField()
+    customer = avocato.StrField(label='customerName')
+    email = avocato.EmailField()
+    total = avocato.DecimalField()
+    paid = avocato.BoolField()
+    weight = avocato.FloatField()
+    created = avocato.DateTimeField(label='createdAt')
+
+
+DATA = {
+    'id': 1337,
+    'customer': 'Spongebob Squarepants',
+    'email': 'spongebob@bikini.bottom',
+    'total': Decimal('12.50'),
+    'paid': True,
+    'weight': 1.25,
+    'created': datetime(2019, 1, 11, 12, 30),
+}
+
+
+if __name__ == '__main__':
+    obj = OrderObject(DATA)
+    assert obj.is_valid()
+    batch = OrderObject([DATA] * 1000, many=True)
+    assert batch.is_valid()
+
+    callables = [
+        ('to_dict + json.dumps', lambda: json.dumps(obj.to_dict(mode='json')).encode()),
+        ('many: to_dict + json.dumps', lambda: json.dumps(batch.to_dict(mode='json')).encode()),
+    ]
+    callables_compiled = [
+        ('to_json_bytes (compiled)', obj.to_json_bytes),
+        ('many: to_json_bytes (compiled)', batch.to_json_bytes),
+    ]
+    pprint(benchmark_callables(callables[:1] + callables_compiled[:1], 10000))
+    pprint(benchmark_callables(callables[1:] + callables_compiled[1:], 10))
+
+    if objects.orjson is not None:
+        OrderObject.use_orjson = True
+        pprint(benchmark_callables([
+            ('to_json_bytes (orjson)', obj.to_json_bytes),
+            ('many: to_json_bytes (orjson)', batch.to_json_bytes),
+        ], 10))
@@ -0,0 +1,29 @@
+from pprint import pprint
+
+from utils import benchmark_callables, make_object_class
+
+
+if __name__ == '__main__':
+    results = {}
+    for num_fields in (5, 50, 300):
+        data = {'f{0}'.format(i): 'value' for i in range(num_fields)}
+        eager_cls = make_object_class(num_fields, lazy=False)
+        lazy_cls = make_object_class(num_fields, lazy=True)
+
+        def read_three(object_cls):
+            obj = object_cls(data)
+            return obj.f0, obj.f1, obj.f2
+
+        def validate(object_cls):
+            obj = object_cls(data)
+            return obj.is_valid() and obj.to_dict()
+
+        results[num_fields] = benchmark_callables([
+            ('eager create', lambda: eager_cls(data)),
+            ('lazy create', lambda: lazy_cls(data)),
+            ('eager create and read 3 fields', lambda: read_three(eager_cls)),
+            ('lazy create and read 3 fields', lambda: read_three(lazy_cls)),
+            ('eager create, validate and to_dict', lambda: validate(eager_cls)),
+            ('lazy create, validate and to_dict', lambda: validate(lazy_cls)),
+        ], 5000)
+    pprint(results)
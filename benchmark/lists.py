@@ -0,0 +1,73 @@
+import sys
+from pprint import pprint
+
+from utils import benchmark_callables
+
+import avocato
+from avocato import objects
+from avocato.validators import OneOf
+
+
+class SamplesObject(avocato.AvocatoObject):
+    sensor = avocato.IntField()
+    readings = avocato.ListField(of=avocato.IntField(validators=[OneOf(range(4096))]))
+
+
+class ArraySamplesObject(SamplesObject):
+    readings = avocato.ListField(
+        of=avocato.IntField(validators=[OneOf(range(4096))]), storage='array'
+    )
+
+
+class NumpySamplesObject(SamplesObject):
+    readings = avocato.ListField(
+        of=avocato.IntField(validators=[OneOf(range(4096))]), storage='numpy'
+    )
+
+
+def each_item(data):
+    """Checking elements with the validators of an item field, what callers had to do before.
+    """
+    # Required would reject zeros.
+    validators = avocato.IntField(validators=[OneOf(range(4096))]).validators[1:]
+    obj = SamplesObject(data)
+    failures = [
+        validator.check(value) for value in data['readings'] for validator in validators
+    ]
+    return obj, [failure for failure in failures if failure is not None]
+
+
+def validate(object_cls, data):
+    obj = object_cls(data)
+    return obj.is_valid()
+
+
+if __name__ == '__main__':
+    data = {'sensor': 1, 'readings': [i % 4096 for i in range(10000)]}
+    pprint(benchmark_callables([
+        ('validators per item', lambda: each_item(data)),
+        ('ListField(of=...)', lambda: validate(SamplesObject, data)),
+        ('storage="array"', lambda: validate(ArraySamplesObject, data)),
+        ('storage="numpy"', lambda: validate(NumpySamplesObject, data)),
+    ], 100))
+
+    print('Bytes per stored list of {0} ints:'.format(len(data['readings'])))
+    for object_cls in (SamplesObject, ArraySamplesObject, NumpySamplesObject):
+        readings = object_cls(data).readings
+        size = sys.getsizeof(readings)
+        if object_cls is SamplesObject:
+            size += sum(map(sys.getsizeof, readings))
+        elif object_cls is NumpySamplesObject:
+            size += readings.nbytes
+        print('  {0}: {1}'.format(object_cls.__name__, size))
+
+    rows = [{'sensor': i + 1, 'readings': data['readings'][:100]} for i in range(1000)]
+    numpy_backend = objects.numpy_backend
+    objects.numpy_backend = None
+    python = benchmark_callables([
+        ('many: Python', lambda: SamplesObject(rows, many=True).is_valid()),
+    ], 20)
+    objects.numpy_backend = numpy_backend
+    pprint(dict(python, **benchmark_callables([
+        ('many: NumPy', lambda: SamplesObject(rows, many=True).is_valid()),
+    ], 20)))
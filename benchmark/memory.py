@@ -0,0 +1,48 @@
+import tracemalloc
+from pprint import pprint
+
+import avocato
+
+
+class SlottedObject(avocato.AvocatoObject):
+    foo = avocato.StrField()
+    bar = avocato.IntField()
+    w = avocato.FloatField()
+    x = avocato.BoolField()
+    y = avocato.StrField()
+
+
+class DictObject(SlottedObject):
+    """Same schema, but stores values on the bare ``Object`` holder.
+    """
+
+    class Meta:
+        model = avocato.Object
+
+
+def bytes_per_record(object_cls, rows):
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+    instances = [object_cls(row).instance for row in rows]
+    allocated = sum(
+        stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(snapshot, 'filename')
+    )
+    tracemalloc.stop()
+    # Don't count the list holding the instances.
+    allocated -= instances.__sizeof__()
+    return allocated / len(rows)
+
+
+if __name__ == '__main__':
+    num_records = 100000
+    rows = [
+        {'foo': 'foo', 'bar': 5, 'w': 1.5, 'x': True, 'y': 'bar'}
+        for _ in range(num_records)
+    ]
+
+    results = {
+        name: bytes_per_record(object_cls, rows)
+        for name, object_cls in [('Object', DictObject), ('slots', SlottedObject)]
+    }
+    results['Saved bytes per record'] = results['Object'] - results['slots']
+    pprint(results)
@@ -0,0 +1,30 @@
+from pprint import pprint
+
+from json_output import DATA, OrderObject
+
+from utils import benchmark_callables
+
+
+if __name__ == '__main__':
+    obj = OrderObject(DATA)
+    assert obj.is_valid()
+    batch = OrderObject([DATA] * 1000, many=True)
+    assert batch.is_valid()
+
+    json_bytes, msgpack_bytes = batch.to_json_bytes(), batch.to_msgpack()
+    print('1000 rows: JSON {0} bytes, MessagePack {1} bytes'.format(
+        len(json_bytes), len(msgpack_bytes)
+    ))
+
+    pprint(benchmark_callables([
+        ('to_json_bytes', obj.to_json_bytes),
+        ('to_msgpack', obj.to_msgpack),
+        ('from_json', lambda: OrderObject.from_json(obj.to_json_bytes())),
+        ('from_msgpack', lambda: OrderObject.from_msgpack(obj.to_msgpack())),
+    ], 10000))
+    pprint(benchmark_callables([
+        ('many: to_json_bytes', batch.to_json_bytes),
+        ('many: to_msgpack', batch.to_msgpack),
+        ('many: from_json', lambda: OrderObject.from_json(json_bytes, many=True)),
+        ('many: from_msgpack', lambda: OrderObject.from_msgpack(msgpack_bytes, many=True)),
+    ], 10))
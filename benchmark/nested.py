@@ -0,0 +1,60 @@
+from pprint import pprint
+
+from utils import benchmark_callables
+
+import avocato
+
+
+class GeoObject(avocato.AvocatoObject):
+    lat = avocato.FloatField()
+    lng = avocato.FloatField()
+
+
+class AddressObject(avocato.AvocatoObject):
+    street = avocato.StrField(max_length=50)
+    city = avocato.StrField(max_length=30)
+    geo = GeoObject()
+
+
+class ItemObject(avocato.AvocatoObject):
+    sku = avocato.StrField()
+    qty = avocato.IntField()
+
+
+class OrderObject(avocato.AvocatoObject):
+    id = avocato.IntField()
+    address = AddressObject()
+    items = ItemObject(many=True)
+
+
+def wrapper_per_child(data):
+    """What nested data needed before nested fields: an object per child dict.
+    """
+    children = [AddressObject(data['address']), GeoObject(data['address']['geo'])]
+    children += [ItemObject(item) for item in data['items']]
+    valid = OrderObject(dict(data, address=None, items=None)).instance is not None
+    for child in children:
+        valid = child.is_valid() and valid
+    return valid, [child.to_dict() for child in children]
+
+
+def compiled(data):
+    order = OrderObject(data)
+    return order.is_valid(), order.to_dict()
+
+
+if __name__ == '__main__':
+    data = {
+        'id': 1,
+        'address': {
+            'street': '124 Conch St.',
+            'city': 'Bikini Bottom',
+            'geo': {'lat': 1.5, 'lng': 2.5},
+        },
+        'items': [{'sku': 'spatula-{0}'.format(i), 'qty': i + 1} for i in range(10)],
+    }
+    assert compiled(data)[0]
+    pprint(benchmark_callables([
+        ('object per nested dict', lambda: wrapper_per_child(data)),
+        ('compiled nested schema', lambda: compiled(data)),
+    ], 2000))
@@ -0,0 +1,36 @@
+from pprint import pprint
+
+from utils import benchmark_callables
+
+import avocato
+
+
+class EventObject(avocato.AvocatoObject):
+    id = avocato.IntField()
+    name = avocato.StrField(max_length=20)
+    email = avocato.EmailField()
+    value = avocato.FloatField()
+
+
+if __name__ == '__main__':
+    num_records = 200000
+    records = [
+        {
+            'id': i + 1,
+            'name': 'event {0}'.format(i),
+            'email': 'user{0}@example.com'.format(i % 5000),
+            'value': i * 0.5 + 1,
+        }
+        for i in range(num_records)
+    ]
+
+    results = benchmark_callables([
+        (
+            '{0} worker(s)'.format(workers),
+            lambda workers=workers: EventObject.validate_many(records, workers=workers),
+        )
+        for workers in (1, 2, 4, 8)
+    ], 1, repetitions=3)
+    for result in results.values():
+        result['Records/s'] = num_records * result['Calls/s']
+    pprint(results)
@@ -0,0 +1,46 @@
+from pprint import pprint
+
+from utils import benchmark_callables
+
+import avocato
+
+
+class FooObject(avocato.AvocatoObject):
+    foo = avocato.StrField()
+    bar = avocato.IntField(attr='baz')
+    w = avocato.FloatField(default=1.5)
+    x = avocato.BoolField()
+    y = avocato.DictField()
+    z = avocato.ListField()
+
+
+def legacy_populate(obj):
+    """The generic loop ``AvocatoObject._populate_instance`` used before it was compiled.
+    """
+    for field in obj._fields:
+        value = None
+        if obj._data:
+            try:
+                value = field._getter(obj._data)
+            except KeyError:
+                pass
+
+        if value is None and obj.instance is not None:
+            value = getattr(obj.instance, field.name, None)
+
+        if value is None:
+            value = field.default
+
+        setattr(obj.instance, field.name, value)
+
+
+if __name__ == '__main__':
+    data = {'foo': 'bar', 'baz': 5, 'x': True, 'y': {'a': 1}}
+    obj = FooObject(data)
+    populate = FooObject._populate_new_func
+
+    pprint(benchmark_callables([
+        ('legacy loop', lambda: legacy_populate(obj)),
+        ('compiled', lambda: populate(obj.instance, data)),
+        ('constructor', lambda: FooObject(data)),
+    ], 100000))
@@ -0,0 +1,23 @@
+from pprint import pprint
+
+from utils import benchmark_callables, make_object_class
+
+
+if __name__ == '__main__':
+    results = {}
+    for num_fields in (5, 50, 300):
+        object_cls = make_object_class(num_fields)
+        names = ['f{0}'.format(i) for i in range(0, num_fields, 5)]
+        obj = object_cls({'f{0}'.format(i): 'value' for i in range(num_fields)})
+        assert obj.is_valid()
+
+        def filter_full_dict():
+            data = obj.to_dict()
+            return {name: data[name] for name in names}
+
+        results[num_fields] = benchmark_callables([
+            ('to_dict and filter', filter_full_dict),
+            ('to_dict(only=...)', lambda: obj.to_dict(only=names)),
+            ('to_json(only=...)', lambda: obj.to_json(only=names)),
+        ], 10000)
+    pprint(results)
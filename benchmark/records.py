@@ -0,0 +1,37 @@
+import json
+from datetime import datetime
+from pprint import pprint
+
+from utils import benchmark_callables
+
+import avocato
+
+
+class SampleObject(avocato.AvocatoObject):
+    id = avocato.IntField()
+    sensor = avocato.StrField(max_length=8)
+    value = avocato.FloatField()
+    ok = avocato.BoolField()
+    taken = avocato.DateTimeField()
+
+
+if __name__ == '__main__':
+    rows = [
+        {'id': i + 1, 'sensor': 'probe-7', 'value': (i + 1) / 3, 'ok': True,
+         'taken': datetime(2019, 1, 11, 12, 30, i % 60)}
+        for i in range(10000)
+    ]
+    batch = SampleObject(rows, many=True)
+    assert batch.is_valid()
+
+    records = batch.pack()
+    json_bytes = batch.to_json_bytes()
+    print('10000 rows: JSON {0} bytes, records {1} bytes'.format(len(json_bytes), len(records)))
+
+    view = memoryview(records)
+    pprint(benchmark_callables([
+        ('to_json_bytes', batch.to_json_bytes),
+        ('pack', batch.pack),
+        ('json.loads', lambda: json.loads(json_bytes)),
+        ('iter_unpack', lambda: list(SampleObject.iter_unpack(view))),
+    ], 5))
@@ -0,0 +1,32 @@
+import itertools
+import random
+from pprint import pprint
+
+from utils import benchmark_callables, make_object_class
+
+
+if __name__ == '__main__':
+    results = {}
+    for num_fields in (5, 50, 300):
+        object_cls = make_object_class(num_fields)
+        obj = object_cls({'f{0}'.format(i): 'value' for i in range(num_fields)})
+        assert obj.is_valid()
+
+        # Different fields change on every call, like edits coming in from users.
+        changes = [
+            tuple('f{0}'.format(random.randrange(num_fields)) for _ in range(2))
+            for _ in range(1000)
+        ]
+        change_iter = itertools.cycle(changes)
+
+        def change_and_validate(full):
+            first, second = next(change_iter)
+            setattr(obj, first, 'changed')
+            setattr(obj, second, 'changed again')
+            return obj.is_valid(full=full)
+
+        results[num_fields] = benchmark_callables([
+            ('full re-validation', lambda: change_and_validate(True)),
+            ('changed fields only', lambda: change_and_validate(False)),
+        ], 10000)
+    pprint(results)
@@ -0,0 +1,59 @@
+import io
+import json
+import time
+import tracemalloc
+from pprint import pprint
+
+import avocato
+
+
+class EventObject(avocato.AvocatoObject):
+    id = avocato.IntField()
+    name = avocato.StrField(max_length=20)
+    kind = avocato.StrField(choices=['click', 'view', 'buy'])
+    value = avocato.FloatField()
+
+
+def make_ndjson(num_records):
+    kinds = ['click', 'view', 'buy', 'unknown']
+    lines = (
+        json.dumps({
+            'id': i + 1,
+            'name': 'event {0}'.format(i),
+            'kind': kinds[i % 4],
+            'value': i * 0.5 + 1,
+        })
+        for i in range(num_records)
+    )
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def consume(source):
+    valid = invalid = 0
+    for _, data, _ in EventObject.iter_validate(source):
+        if data is None:
+            invalid += 1
+        else:
+            valid += 1
+    return valid, invalid
+
+
+if __name__ == '__main__':
+    results = {}
+    for num_records in (50000, 200000):
+        payload = make_ndjson(num_records)
+
+        time_start = time.perf_counter()
+        consume(io.BytesIO(payload))
+        total_time = time.perf_counter() - time_start
+
+        tracemalloc.start()
+        consume(io.BytesIO(payload))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results[num_records] = {
+            'Records/s': num_records / total_time,
+            'Peak memory while validating (KiB)': peak / 1024,
+        }
+    pprint(results)
@@ -1,5 +1,7 @@
 import time
 
+import avocato
+
 
 class DummyObject(object):
     def __init__(self, **kwargs):
@@ -39,3 +41,39 @@ def benchmark_serialization(data, serializers_tuple, num_objects, repetitions=10
             'Avg objects/s': num_objects / avg_time
         }
     return benchmarks
+
+
+def benchmark_callables(callables_tuple, number, repetitions=10):
+    """Times each ``(name, callable)`` pair by calling it ``number`` times per repetition.
+    """
+    benchmarks = {}
+    for name, func in callables_tuple:
+        times = []
+        for _ in range(repetitions):
+            time_start = time.perf_counter()
+            for _ in range(number):
+                func()
+            times.append(time.perf_counter() - time_start)
+
+        best_time = min(times)
+        benchmarks[name] = {
+            'Calls': number,
+            'Best time': best_time,
+            'Calls/s': number / best_time,
+        }
+    return benchmarks
+
+
+def make_object_class(num_fields, make_field=None, **meta):
+    """Returns an ``AvocatoObject`` class with the fields ``f0`` to ``f<num_fields - 1>``.
+
+    ``make_field(i)`` returns the field ``f<i>``, by default a ``StrField(max_length=20)``.
+    Keyword arguments become attributes of the class's ``Meta``, e.g. ``lazy=True``.
+    """
+    if make_field is None:
+        def make_field(i):
+            return avocato.StrField(max_length=20)
+    attrs = {'f{0}'.format(i): make_field(i) for i in range(num_fields)}
+    if meta:
+        attrs['Meta'] = type('Meta', (), meta)
+    return type('Object{0}'.format(num_fields), (avocato.AvocatoObject,), attrs)
@@ -0,0 +1,99 @@
+from collections import defaultdict
+from pprint import pprint
+
+from utils import benchmark_callables
+
+import avocato
+
+
+class FooObject(avocato.AvocatoObject):
+    foo = avocato.StrField(max_length=10)
+    bar = avocato.IntField()
+    w = avocato.FloatField()
+    x = avocato.BoolField()
+    y = avocato.StrField(choices=['a', 'b', 'c'])
+
+    def validate_bar(self, value):
+        if value > 1000:
+            raise avocato.AvocatoValidationError('Too big')
+
+
+def legacy_validate(obj):
+    """The generic loop ``AvocatoObject._validate`` used before it was compiled.
+    """
+    errors = defaultdict(list)
+    for field in obj._fields:
+        field_value = getattr(obj.instance, field.name)
+        if field.validators:
+            for validator in field.validators:
+                try:
+                    validator(field_value)
+                except avocato.AvocatoValidationError as e:
+                    errors[field.name] += e.messages
+                    break
+
+        try:
+            validate_func = getattr(obj, 'validate_{0}'.format(field.name))
+        except AttributeError:
+            pass
+        else:
+            try:
+                validate_func(field_value)
+            except avocato.AvocatoValidationError as e:
+                errors[field.name] += e.messages
+    return dict(errors)
+
+
+def check_chain(obj):
+    """Calling every validator's ``check`` in turn, without fusing the built-in ones.
+    """
+    errors = None
+    instance = obj.instance
+    for field in obj._fields:
+        value = getattr(instance, field.name)
+        for validator in field.validators:
+            failure = validator.check(value)
+            if failure is not None:
+                if errors is None:
+                    errors = {}
+                errors[field.name] = [failure]
+                break
+    return errors
+
+
+def checks_only(obj):
+    """Lower bound: only the validators and the hook, without any bookkeeping.
+    """
+    instance = obj.instance
+    for field in obj._fields:
+        value = getattr(instance, field.name)
+        for validator in field.validators:
+            validator(value)
+    obj.validate_bar(instance.bar)
+
+
+def validate_traffic(objects, read_errors):
+    for obj in objects:
+        if not obj.is_valid() and read_errors:
+            obj.errors
+
+
+if __name__ == '__main__':
+    valid = {'foo': 'bar', 'bar': 5, 'w': 1.5, 'x': True, 'y': 'a'}
+    invalid = {'foo': 'barbarbarbar', 'bar': 5000, 'w': 1, 'x': True, 'y': 'd'}
+    obj = FooObject(valid)
+    assert obj.is_valid()
+
+    pprint(benchmark_callables([
+        ('legacy loop', lambda: legacy_validate(obj)),
+        ('check chain', lambda: check_chain(obj)),
+        ('compiled (fused)', lambda: obj._validate()),
+        ('checks only', lambda: checks_only(obj)),
+    ], 100000))
+
+    # 30% rejected traffic: messages are only rendered for callers that read them.
+    traffic = [FooObject(invalid if i % 10 < 3 else valid) for i in range(1000)]
+    pprint(benchmark_callables([
+        ('30% invalid, errors not read', lambda: validate_traffic(traffic, False)),
+        ('30% invalid, errors read', lambda: validate_traffic(traffic, True)),
+    ], 100))
@@ -38,5 +38,8 @@ setuptools.setup(
     extras_require={
         'peewee': ['peewee>=3.8.1', 'psycopg2-binary>=2.7.6.1'],
         'django': ['django>=2.1.5', 'psycopg2-binary>=2.7.6.1'],
+        'numpy': ['numpy>=1.16'],
+        'orjson': ['orjson>=3'],
+        'msgpack': ['msgpack>=1.0'],
     },
 )
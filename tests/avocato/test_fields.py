@@ -1,7 +1,17 @@
+import array
+
 import pytest
 
 from avocato import validators as avocato_validators
-from avocato.fields import EmailField, Field, MethodField, StrField
+from avocato.fields import (
+    EmailField,
+    Field,
+    FloatField,
+    IntField,
+    ListField,
+    MethodField,
+    StrField,
+)
 
 
 @pytest.mark.parametrize("value,expected", [(5, 5), ("a", "a"), (None, None)])
@@ -69,3 +79,37 @@ def test_method_field():
     serializer = MethodSerializer()
     field = MethodField(attr="foo")
     assert field.as_getter("foo", serializer)() == "bar"
+
+
+def test_list_field_checks_items_with_validators_of_item_field_except_required():
+    field = ListField(of=IntField(validators=[avocato_validators.OneOf([1, 2])]))
+    assert [type(validator) for validator in field.item_validators] == [
+        avocato_validators.OneOfType,
+        avocato_validators.OneOf,
+    ]
+    assert ListField().item_validators is None
+
+
+def test_list_field_storage_converts_lists_to_arrays():
+    field = ListField(of=FloatField(), storage="array")
+    stored = field.to_storage([1.5, 2.0])
+    assert stored == array.array("d", [1.5, 2.0])
+    assert field.to_storage([1.5, 2]) == [1.5, 2]
+    assert field.to_storage([1.5, "2"]) == [1.5, "2"]
+    assert field.to_storage("abc") == "abc"
+    assert ListField(of=IntField(), storage="array").to_storage([1, 2.5]) == [1, 2.5]
+    assert field.to_json_value(stored) == [1.5, 2.0]
+    assert field.to_json_value((1, 2)) == [1, 2]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"of": IntField(), "storage": "list"},
+        {"of": StrField(), "storage": "array"},
+        {"storage": "array"},
+    ],
+)
+def test_list_field_storage_requires_int_or_float_items(kwargs):
+    with pytest.raises(ValueError):
+        ListField(**kwargs)
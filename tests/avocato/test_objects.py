@@ -1,8 +1,32 @@
+import array
+import asyncio
+import io
+import json
+import linecache
+import pickle
+import sqlite3
+import time
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+
 import pytest
 
-from avocato.exceptions import AvocatoError
-from avocato.fields import DictField, IntField, ListField, StrField
-from avocato.objects import AvocatoObject, Object
+from avocato import objects
+from avocato.exceptions import AvocatoError, AvocatoValidationError
+from avocato.fields import (
+    BoolField,
+    DateTimeField,
+    DecimalField,
+    DictField,
+    FloatField,
+    IntField,
+    ListField,
+    MethodField,
+    StrField,
+)
+from avocato.objects import AvocatoObject, Object, SlotsObject
+from avocato.validators import Length, OneOf
 
 
 def test_object_populates_new_instance_on_init():
@@ -12,7 +36,7 @@ def test_object_populates_new_instance_on_init():
 
     obj = FooObj({"foo": 1337, "spongebob": "1234"})
 
-    assert isinstance(obj.instance, Object)
+    assert isinstance(obj.instance, FooObj._meta_model)
     assert obj.instance.foo == 1337
     assert obj.instance.bar == "1234"
     with pytest.raises(AttributeError):
@@ -129,3 +153,1026 @@ def test_object_with_list_field_default_is_immutable_between_objects():
     obj1.foo.append("foobar")
     assert obj1.foo == ["foobar"]
     assert obj2.foo == []
+
+
+def test_object_populate_is_compiled_per_class():
+    class FooObj(AvocatoObject):
+        foo = IntField()
+
+    class BarObj(FooObj):
+        bar = StrField(default="squarepants")
+
+    assert FooObj._populate_func is not BarObj._populate_func
+    obj = BarObj({"foo": 1337})
+    assert obj.foo == 1337
+    assert obj.bar == "squarepants"
+
+
+def test_object_populate_uses_custom_getter():
+    class FooObj(AvocatoObject):
+        foo = MethodField(default=5)
+
+        def get_foo(data):
+            return data["spongebob"] * 2
+
+    assert FooObj({"spongebob": 21}).foo == 42
+    assert FooObj({"patrick": 21}).foo == 5
+
+
+def test_object_populate_reads_data_by_item_lookup():
+    class FooObj(AvocatoObject):
+        foo = IntField()
+        bar = IntField(default=5)
+
+    connection = sqlite3.connect(":memory:")
+    connection.row_factory = sqlite3.Row
+    row = connection.execute("SELECT 1 AS foo, NULL AS bar").fetchone()
+    obj = FooObj(row)
+    assert (obj.foo, obj.bar) == (1, 5)
+    assert FooObj([row, row], many=True)._columns == [[1, 1], [5, 5]]
+
+    data = defaultdict(lambda: 7, foo=1)
+    assert FooObj(data).bar == 7
+    assert FooObj([data], many=True)._columns == [[1], [7]]
+
+
+def test_object_populate_keeps_instance_value_if_data_is_none():
+    class FooObj(AvocatoObject):
+        foo = IntField(default=5)
+        bar = IntField(default=5)
+
+    instance = Object()
+    instance.foo = 1337
+    obj = FooObj({"foo": None, "bar": None}, instance=instance)
+    assert obj.foo == 1337
+    assert obj.bar == 5
+
+
+def test_object_validation_stops_at_first_failing_validator_and_runs_hook():
+    class FooObj(AvocatoObject):
+        foo = StrField(max_length=3)
+        bar = IntField()
+
+        def validate_foo(self, value):
+            raise AvocatoValidationError("Not a squarepants")
+
+    obj = FooObj({"foo": 5, "bar": 1})
+    assert obj.is_valid() is False
+    assert obj.errors == {
+        "foo": [
+            "Value 5 of type <class 'int'> must be one of <class 'str'> type",
+            "Not a squarepants",
+        ]
+    }
+
+
+class Name(str):
+    pass
+
+
+@pytest.mark.parametrize("value", [None, "", 5, b"ab", "abcd", "x", "ab", Name("ab"), Name("x")])
+def test_object_validation_fuses_builtin_validators_with_same_result(value):
+    class FooObj(AvocatoObject):
+        foo = StrField(max_length=3, choices=["ab", "abcd", 1])
+        bar = StrField(validators=[OneOf([["ab"], "ab"])])
+
+    expected = []
+    for validator in FooObj._fields[0].validators:
+        try:
+            validator(value)
+        except AvocatoValidationError as e:
+            expected = e.messages
+            break
+
+    obj = FooObj({"foo": value, "bar": value})
+    obj.is_valid()
+    assert obj.errors.get("foo", []) == expected
+    assert "bar" in obj.errors or value in ("ab", Name("ab"))
+
+    batch = FooObj([{"foo": value, "bar": "ab"}], many=True)
+    batch.is_valid()
+    assert batch.errors.get(0, {}).get("foo", []) == expected
+
+
+def test_object_validation_supports_raising_validators():
+    def not_patrick(value):
+        if value == "patrick":
+            raise AvocatoValidationError("No Patricks")
+
+    class FooObj(AvocatoObject):
+        foo = StrField(validators=[not_patrick], max_length=5)
+
+    assert FooObj({"foo": "bob"}).is_valid()
+    obj = FooObj({"foo": "patrick"})
+    assert obj.is_valid() is False
+    assert obj.errors == {"foo": ["No Patricks"]}
+
+    batch = FooObj([{"foo": "bob"}, {"foo": "patrick"}], many=True)
+    assert batch.is_valid() is False
+    assert batch.errors == {1: {"foo": ["No Patricks"]}}
+
+
+def test_object_validation_calls_overridden_call_of_builtin_validator_subclass():
+    class Strict(Length):
+        def __call__(self, value):
+            if value == "bad":
+                raise AvocatoValidationError("custom bad")
+            return super().__call__(value)
+
+    class FooObj(AvocatoObject):
+        foo = StrField(validators=[Strict(max_length=5)])
+
+    assert FooObj({"foo": "good"}).is_valid()
+    obj = FooObj({"foo": "bad"})
+    assert obj.is_valid() is False
+    assert obj.errors == {"foo": ["custom bad"]}
+    obj = FooObj({"foo": "too long"})
+    assert obj.is_valid() is False
+    assert obj.errors == {"foo": ["Longer than maximum length 5."]}
+
+    batch = FooObj([{"foo": "good"}, {"foo": "bad"}], many=True)
+    assert batch.is_valid() is False
+    assert batch.errors == {1: {"foo": ["custom bad"]}}
+
+
+def test_object_validation_calls_static_hook():
+    class FooObj(AvocatoObject):
+        foo = IntField()
+
+        @staticmethod
+        def validate_foo(value):
+            if value > 10:
+                raise AvocatoValidationError("Too big")
+
+    assert FooObj({"foo": 5}).is_valid()
+    obj = FooObj({"foo": 50})
+    assert obj.is_valid() is False
+    assert obj.errors == {"foo": ["Too big"]}
+
+
+def test_object_validation_returns_no_errors_for_valid_data():
+    class FooObj(AvocatoObject):
+        foo = IntField()
+
+    obj = FooObj({"foo": 1337})
+    assert obj._validate() == {}
+    assert obj.is_valid()
+    assert obj.errors == {}
+
+
+def test_object_to_dict_json_mode_converts_values():
+    class FooObj(AvocatoObject):
+        price = DecimalField(label="cost")
+        created_at = DateTimeField()
+        name = StrField()
+        note = StrField(required=False)
+
+    obj = FooObj(
+        {"price": Decimal("13.37"), "created_at": datetime(2018, 11, 1), "name": "foo"}
+    )
+    assert obj.is_valid()
+    assert obj.to_dict() == {
+        "cost": Decimal("13.37"),
+        "created_at": datetime(2018, 11, 1),
+        "name": "foo",
+        "note": None,
+    }
+    data = obj.to_dict(mode="json")
+    assert data == {
+        "cost": "13.37",
+        "created_at": "2018-11-01T00:00:00",
+        "name": "foo",
+        "note": None,
+    }
+    assert json.loads(json.dumps(data)) == data
+
+
+def test_object_to_dict_raises_on_unknown_mode():
+    class FooObj(AvocatoObject):
+        foo = IntField()
+
+    obj = FooObj({"foo": 1337})
+    assert obj.is_valid()
+    with pytest.raises(ValueError):
+        obj.to_dict(mode="yaml")
+
+
+def test_object_generates_slotted_instance_class():
+    class FooObj(AvocatoObject):
+        foo = IntField()
+        bar = StrField(attr="spongebob")
+
+    class BarObj(FooObj):
+        baz = IntField()
+
+    assert issubclass(FooObj._meta_model, SlotsObject)
+    assert FooObj._meta_model.__slots__ == ("foo", "bar")
+    assert BarObj._meta_model.__slots__ == ("baz", "foo", "bar")
+
+    obj = FooObj({"foo": 1337, "spongebob": "1234"})
+    assert not hasattr(obj.instance, "__dict__")
+    with pytest.raises(AttributeError):
+        obj.instance.spongebob = "1234"
+
+
+def test_object_uses_meta_model_if_given():
+    class Model(object):
+        pass
+
+    class FooObj(AvocatoObject):
+        foo = IntField()
+
+        class Meta:
+            model = Model
+
+    assert FooObj._meta_model is Model
+    obj = FooObj({"foo": 1337})
+    assert isinstance(obj.instance, Model)
+    assert obj.instance.foo == 1337
+
+
+def test_object_fields_are_data_descriptors_forwarding_to_instance():
+    class FooObj(AvocatoObject):
+        foo = IntField()
+
+    assert isinstance(FooObj.foo, property)
+    obj = FooObj({"foo": 1337})
+    obj.foo = 42
+    assert obj.instance.foo == 42
+    obj.instance.foo = 43
+    assert obj.foo == 43
+
+    obj.bar = "not a field"
+    assert obj.__dict__["bar"] == "not a field"
+    assert not hasattr(obj.instance, "bar")
+
+
+def test_object_many_validates_rows_as_batch():
+    class FooObj(AvocatoObject):
+        foo = IntField()
+        bar = StrField(max_length=3, label="baz", default="abc")
+
+        def validate_foo(self, value):
+            if value == 13:
+                raise AvocatoValidationError("Unlucky")
+
+    objs = FooObj(
+        [{"foo": 1, "bar": "a"}, {"foo": "2", "bar": "abcd"}, {"foo": 3}, {"foo": 13}],
+        many=True,
+    )
+    assert objs.is_valid() is False
+    assert objs.errors == {
+        1: {
+            "foo": ["Value 2 of type <class 'str'> must be one of <class 'int'> type"],
+            "bar": ["Longer than maximum length 3."],
+        },
+        3: {"foo": ["Unlucky"]},
+    }
+    assert list(objs.errors) == [1, 3]
+    assert objs.valid_data == [{"foo": 1, "baz": "a"}, {"foo": 3, "baz": "abc"}]
+    with pytest.raises(AvocatoError):
+        objs.to_dict()
+
+
+def test_object_many_to_dict_returns_list():
+    class FooObj(AvocatoObject):
+        foo = IntField()
+        price = DecimalField()
+
+    objs = FooObj(
+        ({"foo": i, "price": Decimal(i)} for i in range(1, 4)), many=True
+    )
+    with pytest.raises(AvocatoError):
+        objs.valid_data
+    assert objs.is_valid()
+    assert objs.valid_data == objs.to_dict()
+    assert objs.to_dict(mode="json") == [
+        {"foo": 1, "price": "1"},
+        {"foo": 2, "price": "2"},
+        {"foo": 3, "price": "3"},
+    ]
+
+
+def test_object_many_does_not_accept_instance():
+    class FooObj(AvocatoObject):
+        foo = IntField()
+
+    with pytest.raises(AvocatoError):
+        FooObj([{"foo": 1}], instance=Object(), many=True)
+
+
+class StreamObject(AvocatoObject):
+    foo = IntField()
+    bar = StrField(default="bar")
+
+
+def test_object_iter_validate_yields_results_in_order():
+    records = ({"foo": i} if i % 3 else {"foo": str(i)} for i in range(7))
+    results = list(StreamObject.iter_validate(records, chunk_size=2))
+
+    assert [index for index, _, _ in results] == list(range(7))
+    assert results[1] == (1, {"foo": 1, "bar": "bar"}, None)
+    assert results[3] == (
+        3,
+        None,
+        {"foo": ["Value 3 of type <class 'str'> must be one of <class 'int'> type"]},
+    )
+    assert [index for index, data, _ in results if data is None] == [0, 3, 6]
+
+
+def test_object_iter_validate_reads_ndjson_file():
+    source = io.BytesIO(b'{"foo": 1, "bar": "baz"}\n\n{"foo": 0}\n{"foo": 2}')
+    assert list(StreamObject.iter_validate(source)) == [
+        (0, {"foo": 1, "bar": "baz"}, None),
+        (1, None, {"foo": ["This field is required"]}),
+        (2, {"foo": 2, "bar": "bar"}, None),
+    ]
+
+
+def test_object_iter_validate_is_lazy():
+    def records():
+        yield {"foo": 1}
+        raise RuntimeError("Consumed too far")
+
+    results = StreamObject.iter_validate(records(), chunk_size=1)
+    assert next(results) == (0, {"foo": 1, "bar": "bar"}, None)
+    with pytest.raises(RuntimeError):
+        next(results)
+
+
+class AsyncObject(AvocatoObject):
+    foo = IntField()
+    bar = StrField()
+    baz = IntField()
+
+    async def validate_foo(self, value):
+        await asyncio.sleep(0.05)
+        if value > 10:
+            raise AvocatoValidationError("Too big")
+
+    async def validate_bar(self, value):
+        await asyncio.sleep(0.05)
+        if value == "taken":
+            raise AvocatoValidationError("Already taken")
+
+
+def test_object_with_async_hooks_requires_async_validation():
+    obj = AsyncObject({"foo": 1, "bar": "a", "baz": 1})
+    assert AsyncObject._is_async
+    with pytest.raises(AvocatoError):
+        obj.is_valid()
+
+
+def test_object_is_valid_async_runs_hooks_concurrently():
+    obj = AsyncObject({"foo": 11, "bar": "taken", "baz": "1"})
+
+    loop = asyncio.new_event_loop()
+    try:
+        start = time.monotonic()
+        assert loop.run_until_complete(obj.is_valid_async()) is False
+        assert time.monotonic() - start < 0.09
+    finally:
+        loop.close()
+
+    assert obj.errors == {
+        "foo": ["Too big"],
+        "bar": ["Already taken"],
+        "baz": ["Value 1 of type <class 'str'> must be one of <class 'int'> type"],
+    }
+
+
+def test_object_is_valid_async_supports_async_validators():
+    class AsyncValidator(object):
+        async def __call__(self, value):
+            if value == 13:
+                raise AvocatoValidationError("Unlucky")
+
+    class FooObj(AvocatoObject):
+        foo = IntField(validators=[AsyncValidator()])
+
+        def validate_foo(self, value):
+            raise AvocatoValidationError("Always wrong")
+
+    assert FooObj._is_async
+    loop = asyncio.new_event_loop()
+    try:
+        obj = FooObj({"foo": 13})
+        assert loop.run_until_complete(obj.is_valid_async()) is False
+        assert obj.errors == {"foo": ["Unlucky", "Always wrong"]}
+        obj = FooObj({"foo": "13"})
+        assert loop.run_until_complete(obj.is_valid_async()) is False
+        assert obj.errors["foo"][1] == "Always wrong"
+    finally:
+        loop.close()
+
+
+def test_object_is_valid_async_uses_sync_path_for_sync_objects():
+    class FooObj(AvocatoObject):
+        foo = IntField()
+
+    assert not FooObj._is_async
+    obj = FooObj({"foo": 1337})
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(obj.is_valid_async())
+    finally:
+        loop.close()
+    assert obj.to_dict() == {"foo": 1337}
+
+
+class ParallelObject(AvocatoObject):
+    foo = IntField()
+    bar = StrField(max_length=3)
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_object_validate_many_merges_results_in_input_order(workers):
+    records = [{"foo": i, "bar": "abc" if i % 4 else "abcd"} for i in range(1, 11)]
+    valid_data, errors = ParallelObject.validate_many(records, workers=workers, chunk_size=3)
+
+    assert valid_data == [records[i] for i in range(10) if (i + 1) % 4]
+    assert errors == {
+        3: {"bar": ["Longer than maximum length 3."]},
+        7: {"bar": ["Longer than maximum length 3."]},
+    }
+
+
+@pytest.mark.parametrize("shared", [True, False])
+def test_object_validate_many_releases_or_skips_shared_memory(shared, monkeypatch):
+    created = []
+    released = []
+    create_segment = objects._create_segment
+    release_segment = objects._release_segment
+
+    def fake_create_segment(size):
+        shm = create_segment(size) if shared else None
+        created.append(shm)
+        return shm
+
+    def fake_release_segment(shm):
+        released.append(shm)
+        release_segment(shm)
+
+    monkeypatch.setattr(objects, "_create_segment", fake_create_segment)
+    monkeypatch.setattr(objects, "_release_segment", fake_release_segment)
+    records = [{"foo": i, "bar": "abc" if i % 4 else "abcd"} for i in range(1, 11)]
+    valid_data, errors = ParallelObject.validate_many(records, workers=2, chunk_size=1)
+
+    assert valid_data == [records[i] for i in range(10) if (i + 1) % 4]
+    assert set(errors) == {3, 7}
+    assert len(created) == 10
+    # Segments are released in the order the chunks finish.
+    assert sorted(map(id, released)) == sorted(map(id, created if shared else []))
+
+
+def test_object_methods_are_not_hooks_of_fields_with_the_same_name():
+    class FooObj(AvocatoObject):
+        many = IntField()
+
+    obj = FooObj({"many": 3})
+    assert obj.is_valid()
+    assert FooObj([{"many": 3}], many=True).is_valid()
+
+    class BarObj(FooObj):
+        def validate_many(self, value):
+            raise AvocatoValidationError("Too many")
+
+    obj = BarObj({"many": 3})
+    assert obj.is_valid() is False
+    assert obj.errors == {"many": ["Too many"]}
+
+
+def test_object_validate_many_requires_module_level_class_for_workers():
+    class FooObj(AvocatoObject):
+        foo = IntField()
+
+    with pytest.raises(AvocatoError):
+        FooObj.validate_many([{"foo": 1}], workers=2)
+
+
+def test_object_errors_are_rendered_when_read(mocker):
+    class FooObj(AvocatoObject):
+        foo = IntField()
+
+    obj = FooObj({"foo": "1"})
+    format_error = mocker.spy(FooObj._fields[0].validators[1], "_format_error")
+    assert obj.is_valid() is False
+    assert format_error.call_count == 0
+    assert obj.errors == {
+        "foo": ["Value 1 of type <class 'str'> must be one of <class 'int'> type"]
+    }
+    assert obj.errors is obj.errors
+    assert format_error.call_count == 1
+
+
+class JsonObject(AvocatoObject):
+    name = StrField(label="na%me")
+    count = IntField()
+    ratio = FloatField()
+    sold_out = BoolField(required=False)
+    price = DecimalField()
+    created = DateTimeField()
+    tags = DictField(required=False)
+    note = StrField(required=False)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_object_to_json_encodes_json_mode_dict(use_orjson, monkeypatch):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    monkeypatch.setattr(JsonObject, "use_orjson", use_orjson)
+
+    data = {
+        "name": "Spöngebob \"Squarepants\"\n",
+        "count": 3,
+        "ratio": 0.1,
+        "sold_out": False,
+        "price": Decimal("1.10"),
+        "created": datetime(2019, 1, 11, 12, 30),
+        "tags": {"pineapple": [1, 2]},
+    }
+    obj = JsonObject(data)
+    assert obj.is_valid()
+    assert json.loads(obj.to_json()) == obj.to_dict(mode="json")
+    assert obj.to_json_bytes() == obj.to_json().encode("utf-8")
+    assert b" " not in obj.to_json_bytes().replace(b"Sp\xc3\xb6ngebob ", b"")
+
+    batch = JsonObject([data, dict(data, note="rock")], many=True)
+    assert batch.is_valid()
+    assert json.loads(batch.to_json_bytes()) == batch.to_dict(mode="json")
+
+
+def test_object_to_json_raises_if_is_valid_has_not_been_run():
+    with pytest.raises(AvocatoError):
+        JsonObject({"name": "Gary"}).to_json()
+
+
+def test_object_to_json_uses_compiled_encoder_by_default():
+    data = {
+        "name": "Gary",
+        "count": 2 ** 70,
+        "ratio": float("nan"),
+        "price": Decimal("1"),
+        "created": datetime(2019, 1, 11),
+        "tags": {"inf": float("-inf")},
+    }
+    obj = JsonObject(data)
+    assert obj.is_valid()
+    assert obj.to_json() == json.dumps(obj.to_dict(mode="json"), separators=(",", ":"))
+    assert '"count":1180591620717411303424,"ratio":NaN' in obj.to_json()
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_object_from_json_decodes_and_populates(use_orjson, monkeypatch):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr("avocato.objects.orjson", None)
+
+    obj = JsonObject.from_json(b'{"name": "Gary", "count": 1, "unknown": {"x": [1, 2]}}')
+    assert obj.name == "Gary"
+    assert obj.count == 1
+
+    batch = JsonObject.from_json('[{"count": 1}, {"count": 2}]', many=True)
+    assert batch._columns[1] == [1, 2]
+
+    with pytest.raises(AvocatoError):
+        JsonObject.from_json(b"[]")
+    with pytest.raises(AvocatoError):
+        JsonObject.from_json(b"{}", many=True)
+    with pytest.raises(ValueError):
+        JsonObject.from_json(b"{")
+
+
+def test_object_from_json_uses_given_decoder(mocker):
+    loads = mocker.Mock(return_value={"count": 5})
+    assert JsonObject.from_json(b"...", loads=loads).count == 5
+    loads.assert_called_once_with(b"...")
+
+
+class Address(AvocatoObject):
+    city = StrField(max_length=10)
+
+    def validate_city(self, value):
+        if value == "Atlantis":
+            raise AvocatoValidationError("Sunk")
+
+
+class LineItem(AvocatoObject):
+    sku = StrField()
+    qty = IntField()
+
+
+class Order(AvocatoObject):
+    id = IntField()
+    address = Address()
+    items = LineItem(many=True, required=False, label="lineItems")
+
+    def validate_address(self, value):
+        if getattr(value, "city", None) == "Nowhere":
+            raise AvocatoValidationError("Unknown city")
+
+
+def test_object_nested_fields_populate_validate_and_serialize():
+    order = Order({"id": 1, "address": {"city": "Bikini"}, "items": [{"sku": "a", "qty": 2}]})
+
+    assert isinstance(order.instance.address, Address._meta_model)
+    assert order.address.city == "Bikini"
+    assert order.items[0].qty == 2
+    assert order.is_valid()
+    expected = {"id": 1, "address": {"city": "Bikini"}, "lineItems": [{"sku": "a", "qty": 2}]}
+    assert order.to_dict() == expected
+    assert json.loads(order.to_json()) == expected
+
+
+def test_object_nested_field_errors_are_nested():
+    order = Order({
+        "id": 1,
+        "address": {"city": "Atlantis"},
+        "items": [{"sku": "a"}, "b", {"sku": "c", "qty": 1}],
+    })
+
+    assert order.is_valid() is False
+    assert order.errors == {
+        "address": {"city": ["Sunk"]},
+        "items": {
+            0: {"qty": ["This field is required"]},
+            1: [
+                "Value b of type <class 'str'> must be one of "
+                "<class 'collections.abc.Mapping'> type"
+            ],
+        },
+    }
+
+
+def test_object_nested_field_rejects_wrong_types():
+    order = Order({"id": 1, "address": "Bikini", "items": {"sku": "a"}})
+
+    assert order.is_valid() is False
+    assert set(order.errors) == {"address", "items"}
+    assert order.errors["address"][0].startswith("Value Bikini of type <class 'str'>")
+    assert order.errors["items"][0].startswith("Value {'sku': 'a'} of type <class 'dict'>")
+
+
+def test_object_nested_field_hook_errors_go_under_schema_key():
+    order = Order({"id": 1, "address": {"city": "Nowhere"}})
+    assert order.is_valid() is False
+    assert order.errors == {"address": ["Unknown city"]}
+
+    order = Order({"id": 1})
+    assert order.is_valid() is False
+    assert order.errors == {"address": ["This field is required"]}
+
+
+class Range(AvocatoObject):
+    lo = IntField()
+    hi = IntField()
+
+    def validate_hi(self, value):
+        if value < self.lo:
+            raise AvocatoValidationError("hi < lo")
+
+
+class Ranges(AvocatoObject):
+    range = Range()
+    ranges = Range(many=True, required=False)
+
+
+def test_object_nested_field_hooks_see_nested_value():
+    assert Range({"lo": 5, "hi": 1}).is_valid() is False
+
+    obj = Ranges({"range": {"lo": 5, "hi": 1}, "ranges": [{"lo": 1, "hi": 2}, {"lo": 3, "hi": 2}]})
+    assert obj.is_valid() is False
+    assert obj.errors == {"range": {"hi": ["hi < lo"]}, "ranges": {1: {"hi": ["hi < lo"]}}}
+    assert Ranges({"range": {"lo": 1, "hi": 5}}).is_valid()
+
+    batch = Ranges([{"range": {"lo": 1, "hi": 5}}, {"range": {"lo": 5, "hi": 1}}], many=True)
+    assert batch.is_valid() is False
+    assert batch.errors == {1: {"range": {"hi": ["hi < lo"]}}}
+
+
+def test_object_nested_fields_in_batches():
+    orders = Order([
+        {"id": 1, "address": {"city": "Bikini"}},
+        {"id": 2, "address": {"city": "Atlantis"}, "items": [{"qty": 1}]},
+    ], many=True)
+
+    assert orders.is_valid() is False
+    assert orders.errors == {
+        1: {
+            "address": {"city": ["Sunk"]},
+            "items": {0: {"sku": ["This field is required"]}},
+        },
+    }
+    assert orders.valid_data == [{"id": 1, "address": {"city": "Bikini"}, "lineItems": None}]
+
+
+def test_object_nested_fields_validate_async():
+    class AsyncOrder(AvocatoObject):
+        address = Address()
+
+        async def validate_address(self, value):
+            await asyncio.sleep(0)
+            raise AvocatoValidationError("Closed")
+
+    order = AsyncOrder({"address": {"city": "Atlantis"}})
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(order.is_valid_async()) is False
+    finally:
+        loop.close()
+    assert order.errors == {"address": {"city": ["Sunk"], "_schema": ["Closed"]}}
+
+
+class SeriesObject(AvocatoObject):
+    ids = ListField(of=IntField(validators=[OneOf(range(10))]))
+    samples = ListField(of=FloatField(), storage="array", required=False)
+    tags = ListField(required=False)
+
+    def validate_ids(self, value):
+        if isinstance(value, list) and 7 in value:
+            raise AvocatoValidationError("Unlucky")
+
+
+def test_object_list_field_checks_items():
+    obj = SeriesObject({"ids": [1, 0, "2", None, 7, 12], "tags": "free-form"})
+
+    assert obj.is_valid() is False
+    assert obj.errors == {
+        "ids": {
+            2: ["Value 2 of type <class 'str'> must be one of <class 'int'> type"],
+            3: ["Value None of type <class 'NoneType'> must be one of <class 'int'> type"],
+            5: ["Value 12 must be one of 0, 1, 2, 3, 4, 5, 6, 7, 8, 9."],
+            "_schema": ["Unlucky"],
+        },
+    }
+
+    obj = SeriesObject({"ids": (1, 2), "samples": 1.5})
+    assert obj.is_valid() is False
+    assert obj.errors == {
+        "samples": [
+            "Value 1.5 of type <class 'float'> must be one of <class 'list'>, <class 'tuple'>, "
+            "<class 'array.array'> type"
+        ],
+    }
+
+
+def test_object_list_field_storage_keeps_arrays_and_serializes_lists():
+    obj = SeriesObject({"ids": [1, 2], "samples": [1.5, 2.0]})
+
+    assert obj.samples == array.array("d", [1.5, 2.0])
+    assert obj.is_valid()
+    assert obj.to_dict(mode="json") == {"ids": [1, 2], "samples": [1.5, 2.0], "tags": []}
+    assert json.loads(obj.to_json()) == {"ids": [1, 2], "samples": [1.5, 2.0], "tags": []}
+
+    obj = SeriesObject({"ids": [1], "samples": [1.5, "2"]})
+    assert obj.samples == [1.5, "2"]
+    assert obj.is_valid() is False
+    assert obj.errors == {
+        "samples": {1: ["Value 2 of type <class 'str'> must be one of <class 'float'> type"]},
+    }
+
+    # Ints aren't cast to floats, so they fail like they do without storage.
+    obj = SeriesObject({"ids": [1], "samples": [1.5, 2]})
+    assert obj.samples == [1.5, 2]
+    assert obj.is_valid() is False
+    assert obj.errors == {
+        "samples": {1: ["Value 2 of type <class 'int'> must be one of <class 'float'> type"]},
+    }
+
+
+def test_object_list_field_in_batches():
+    objs = SeriesObject([{"ids": [1], "samples": [0.5]}, {"ids": [1, 20]}], many=True)
+
+    assert objs.is_valid() is False
+    assert objs.errors == {
+        1: {"ids": {1: ["Value 20 must be one of 0, 1, 2, 3, 4, 5, 6, 7, 8, 9."]}},
+    }
+    assert objs.valid_data == [{"ids": [1], "samples": array.array("d", [0.5]), "tags": []}]
+
+
+def test_object_tracks_changed_fields():
+    class FooObj(AvocatoObject):
+        foo = IntField()
+        bar = StrField(required=False)
+
+    obj = FooObj({"foo": 1})
+    assert obj.changed_fields == frozenset()
+
+    obj.foo = 2
+    obj.bar = "a"
+    assert obj.changed_fields == {"foo", "bar"}
+    assert obj.is_valid()
+    assert obj.changed_fields == {"foo", "bar"}
+
+    obj.clear_changed_fields()
+    assert obj.changed_fields == frozenset()
+
+
+def test_object_is_valid_rechecks_changed_fields_and_all_hooks(mocker):
+    class FooObj(AvocatoObject):
+        foo = IntField()
+        bar = StrField(max_length=3)
+        baz = IntField()
+
+        validate_bar = mocker.Mock()
+        validate_baz = mocker.Mock()
+
+    obj = FooObj({"foo": 1, "bar": "a", "baz": 3})
+    assert obj.is_valid()
+    assert FooObj.validate_bar.call_count == 1
+
+    # Untracked change, only a full validation sees it.
+    obj.instance.foo = "1"
+    obj.bar = "abcd"
+    assert obj.is_valid() is False
+    assert obj.errors == {"bar": ["Longer than maximum length 3."]}
+    assert FooObj.validate_bar.call_count == 2
+    assert FooObj.validate_baz.call_count == 2
+
+    obj.bar = "ab"
+    assert obj.is_valid()
+    assert obj.is_valid()
+    assert FooObj.validate_bar.call_count == 3
+    assert FooObj.validate_baz.call_count == 3
+    assert obj.is_valid(full=True) is False
+    assert set(obj.errors) == {"foo"}
+    assert FooObj.validate_baz.call_count == 4
+    # Incremental passes use the checks compiled with the class.
+    assert not FooObj._compiled_subsets
+
+
+def test_object_is_valid_reruns_hooks_reading_changed_fields():
+    class RangeObj(AvocatoObject):
+        lo = IntField()
+        hi = IntField()
+
+        def validate_hi(self, value):
+            if value < self.lo:
+                raise AvocatoValidationError("hi < lo")
+
+    obj = RangeObj({"lo": 1, "hi": 5})
+    assert obj.is_valid()
+
+    obj.lo = 10
+    assert obj.is_valid() is False
+    assert obj.errors == {"hi": ["hi < lo"]}
+
+    obj.lo = 2
+    assert obj.is_valid()
+
+
+def test_object_subset_functions_are_cached_per_class(monkeypatch):
+    class FooObj(AvocatoObject):
+        foo = IntField()
+        bar = IntField()
+        baz = IntField()
+
+    monkeypatch.setattr(FooObj, "compiled_subsets_size", 2)
+    validate_foo = FooObj._subset_function("validate", frozenset(["foo"]))
+    assert FooObj._subset_function("validate", frozenset(["foo"])) is validate_foo
+    FooObj._subset_function("validate", frozenset(["bar"]))
+    FooObj._subset_function("validate", frozenset(["foo"]))
+    FooObj._subset_function("validate", frozenset(["baz"]))
+    assert list(FooObj._compiled_subsets) == [
+        ("validate", frozenset(["foo"])),
+        ("validate", frozenset(["baz"])),
+    ]
+    assert AvocatoObject._compiled_subsets is not FooObj._compiled_subsets
+
+
+def test_object_evicted_subset_functions_release_their_source(monkeypatch):
+    class FooObj(AvocatoObject):
+        foo = IntField()
+        bar = IntField()
+
+    monkeypatch.setattr(FooObj, "compiled_subsets_size", 1)
+    obj = FooObj({"foo": 1, "bar": 2})
+    assert obj.is_valid()
+    size = len(linecache.cache)
+    for _ in range(10):
+        obj.to_dict(only=["foo"])
+        obj.to_dict(only=["bar"])
+    assert len(linecache.cache) == size + 1
+    to_dict_bar = FooObj._subset_function("to_dict", frozenset(["bar"]))
+    assert to_dict_bar.__code__.co_filename in linecache.cache
+
+
+class LazyFoo(AvocatoObject):
+    foo = IntField()
+    bar = StrField(default="bar")
+    tags = ListField(of=StrField(), required=False)
+
+    class Meta:
+        lazy = True
+
+
+def test_lazy_object_loads_fields_on_access():
+    data = {"foo": 1, "tags": ["a"]}
+    obj = LazyFoo(data)
+    assert obj.instance._lazy_data is data
+    assert obj.instance._lazy_loaded == set()
+
+    assert obj.foo == 1
+    assert obj.bar == "bar"
+    assert obj.instance._lazy_loaded == {"foo", "bar"}
+
+
+def test_lazy_object_materializes_before_validation():
+    obj = LazyFoo({"foo": 1, "bar": "x", "tags": ["a"]})
+    obj.tags.append("b")
+    obj.bar = "y"
+
+    assert obj.is_valid()
+    assert type(obj.instance) is LazyFoo._meta_model
+    assert not hasattr(obj.instance, "_lazy_data")
+    assert obj.to_dict() == {"foo": 1, "bar": "y", "tags": ["a", "b"]}
+
+    obj = LazyFoo({"foo": 0})
+    assert not obj.is_valid()
+    assert obj.errors == {"foo": ["This field is required"]}
+
+
+def test_lazy_object_without_data_uses_defaults():
+    obj = LazyFoo()
+    obj.foo = 1
+    assert obj.is_valid()
+    assert obj.to_dict() == {"foo": 1, "bar": "bar", "tags": []}
+
+
+def test_lazy_object_instances_can_be_pickled():
+    obj = LazyFoo({"foo": 1})
+    assert pickle.loads(pickle.dumps(obj.instance)).foo == 1
+
+
+def test_lazy_object_cant_have_meta_model():
+    with pytest.raises(AvocatoError):
+
+        class FooObj(AvocatoObject):
+            foo = IntField()
+
+            class Meta:
+                lazy = True
+                model = Object
+
+
+class ProjectedObject(AvocatoObject):
+    foo = IntField()
+    bar = StrField(label="Bar")
+    baz = DateTimeField(required=False)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_object_projections(use_orjson, monkeypatch):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    monkeypatch.setattr(ProjectedObject, "use_orjson", use_orjson)
+
+    data = {"foo": 1, "bar": "x", "baz": datetime(2020, 1, 2)}
+    obj = ProjectedObject(data)
+    assert obj.is_valid()
+    assert obj.to_dict(only=["foo", "baz"]) == {"foo": 1, "baz": datetime(2020, 1, 2)}
+    assert obj.to_dict(mode="json", exclude=["foo"]) == {"Bar": "x", "baz": "2020-01-02T00:00:00"}
+    assert obj.to_dict(only=["foo", "bar"], exclude=["bar"]) == {"foo": 1}
+    assert json.loads(obj.to_json(exclude=["baz"])) == {"foo": 1, "Bar": "x"}
+    assert obj.to_json(only=[]) == "{}"
+    assert obj.to_dict(exclude=[]) == obj.to_dict()
+
+    batch = ProjectedObject([data, dict(data, foo=2)], many=True)
+    assert batch.is_valid()
+    assert batch.to_dict(only=["foo"]) == [{"foo": 1}, {"foo": 2}]
+    assert json.loads(batch.to_json(only=["bar"])) == [{"Bar": "x"}, {"Bar": "x"}]
+    assert batch.to_dict(only=[]) == [{}, {}]
+
+    with pytest.raises(ValueError):
+        obj.to_dict(only=["foo", "missing"])
+
+
+def test_object_is_valid_checks_projected_fields():
+    obj = ProjectedObject({"foo": 1, "bar": 2})
+    assert obj.is_valid(only=["foo"])
+    assert obj.to_dict(only=["foo"]) == {"foo": 1}
+    with pytest.raises(AvocatoError):
+        obj.to_dict()
+    with pytest.raises(AvocatoError):
+        obj.to_dict(exclude=["baz"])
+    assert not obj.is_valid()
+    assert set(obj.errors) == {"bar"}
+
+    batch = ProjectedObject([{"foo": 0, "bar": "x"}, {"foo": 1, "bar": 2}], many=True)
+    assert not batch.is_valid(exclude=["foo"])
+    assert set(batch.errors) == {1}
+    with pytest.raises(AvocatoError):
+        batch.valid_data
+
+
+def test_object_projections_are_cached():
+    class FooObj(ProjectedObject):
+        pass
+
+    obj = FooObj({"foo": 1, "bar": "x"})
+    assert obj.is_valid()
+    obj.to_dict(only=["foo"])
+    obj.to_dict(only=("foo",))
+    obj.to_dict(exclude=["bar", "baz"])
+    assert list(FooObj._compiled_subsets) == [("to_dict", frozenset(["foo"]))]
@@ -0,0 +1,87 @@
+import mmap
+from datetime import datetime, timezone
+
+import pytest
+
+from avocato.exceptions import AvocatoError
+from avocato.fields import BoolField, DateTimeField, DictField, FloatField, IntField, StrField
+from avocato.objects import AvocatoObject
+from avocato.records import RecordLayout
+
+
+class SampleObject(AvocatoObject):
+    id = IntField()
+    name = StrField(max_length=5, label="fullName")
+    weight = FloatField(required=False)
+    active = BoolField(required=False)
+    created = DateTimeField()
+
+
+ROWS = [
+    {"id": 1, "name": "Gary", "weight": 1.5, "active": True, "created": datetime(2019, 1, 11)},
+    {"id": 2, "name": "Spöng", "created": datetime(1960, 5, 4, 3, 2, 1, 123)},
+]
+
+
+def test_record_layout_is_derived_from_fields():
+    layout = SampleObject.record_layout()
+    assert layout is SampleObject.record_layout()
+    assert layout.format == "<BqH20sd?q"
+    assert layout.size == 1 + 8 + 2 + 20 + 8 + 1 + 8
+
+    class TagsObject(AvocatoObject):
+        tags = DictField()
+
+    class NoteObject(AvocatoObject):
+        note = StrField()
+
+    with pytest.raises(AvocatoError):
+        TagsObject.record_layout()
+    with pytest.raises(AvocatoError):
+        NoteObject.record_layout()
+    with pytest.raises(AvocatoError):
+        RecordLayout([IntField()] * 65)
+
+
+def test_object_pack_and_unpack_round_trip():
+    obj = SampleObject(ROWS[1])
+    assert obj.is_valid()
+
+    record = obj.pack()
+    assert len(record) == SampleObject.record_layout().size
+
+    copy = SampleObject.unpack(record)
+    assert copy.is_valid()
+    assert copy.to_dict() == obj.to_dict()
+    assert copy.weight is None and copy.active is None
+
+
+def test_object_iter_unpack_reads_records_in_place(tmp_path):
+    batch = SampleObject(ROWS + [{"id": 3}], many=True)
+    assert batch.is_valid() is False
+
+    path = tmp_path / "samples.bin"
+    path.write_bytes(batch.pack())
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        view = memoryview(buffer)
+        try:
+            assert list(SampleObject.iter_unpack(view)) == batch.valid_data
+        finally:
+            view.release()
+
+    copies = SampleObject.unpack(path.read_bytes(), many=True)
+    assert copies.is_valid()
+    assert copies.to_dict() == batch.valid_data
+
+
+def test_object_pack_rejects_values_that_do_not_fit():
+    layout = SampleObject.record_layout()
+    with pytest.raises(AvocatoError):
+        layout.pack([2 ** 63, "a", None, None, datetime(2019, 1, 11)])
+    with pytest.raises(AvocatoError):
+        layout.pack([1, "a" * 21, None, None, datetime(2019, 1, 11)])
+    with pytest.raises(AvocatoError):
+        layout.pack([1, "a", None, None, datetime(2019, 1, 11, tzinfo=timezone.utc)])
+
+    with pytest.raises(AvocatoError):
+        SampleObject(ROWS[0]).pack()
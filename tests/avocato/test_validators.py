@@ -0,0 +1,161 @@
+import pytest
+
+from avocato.exceptions import AvocatoValidationError, ValidationFailure
+from avocato.validators import Email, Length, NotEmpty, OneOf, OneOfType, Required, Validator
+
+
+@pytest.mark.parametrize(
+    "validator,value,message",
+    [
+        (Required(), "", "This field is required"),
+        (Email(), "spongebob", "Not a valid email address."),
+        (Email(message="{input} is not an email"), "a@", "a@ is not an email"),
+        (Length(max_length=3), "abcd", "Longer than maximum length 3."),
+        (Length(min_length=2, max_length=3), "a", "Length must be between 2 and 3."),
+        (Length(equal=2), "a", "Length must be 2."),
+        (OneOf(["a", "b"]), "c", "Value c must be one of a, b."),
+        (OneOfType((int,)), "1", "Value 1 of type <class 'str'> must be one of <class 'int'> type"),
+    ],
+)
+def test_validator_raises_failure_with_message(validator, value, message):
+    with pytest.raises(AvocatoValidationError) as e:
+        validator(value)
+
+    assert isinstance(e.value.raw_messages[0], ValidationFailure)
+    assert e.value.messages == [message]
+    assert str(e.value) == message
+
+
+def test_validation_failure_is_rendered_only_when_read(mocker):
+    validator = Required()
+    format_error = mocker.spy(validator, "_format_error")
+
+    with pytest.raises(AvocatoValidationError) as e:
+        validator(None)
+    assert format_error.call_count == 0
+
+    assert e.value.messages == ["This field is required"]
+    assert format_error.call_count == 1
+
+
+def test_email_does_not_format_message_for_valid_value(mocker):
+    validator = Email()
+    format_error = mocker.spy(validator, "_format_error")
+    assert validator("spongebob@bikini.bottom") == "spongebob@bikini.bottom"
+    assert format_error.call_count == 0
+
+
+def test_validation_error_normalises_messages_and_field_names():
+    e = AvocatoValidationError("foo", field_names="bar")
+    assert e.messages == ["foo"]
+    assert e.field_names == ["bar"]
+
+    e = AvocatoValidationError({"foo": [ValidationFailure(Required(), None)]})
+    assert e.messages == {"foo": ["This field is required"]}
+    assert e.field_names == []
+
+
+@pytest.mark.parametrize(
+    "validator,valid,invalid",
+    [
+        (Required(), "a", ""),
+        (NotEmpty(), [0], []),
+        (Email(), "spongebob@bikini.bottom", "spongebob"),
+        (Length(max_length=3), "abc", "abcd"),
+        (OneOf(["a", "b"]), "a", ["a"]),
+        (OneOfType((int,)), 1, "1"),
+    ],
+)
+def test_validator_check_returns_failure_instead_of_raising(validator, valid, invalid):
+    assert validator.check(valid) is None
+    failure = validator.check(invalid)
+    assert isinstance(failure, ValidationFailure)
+    assert failure.raw_messages == [failure]
+
+
+def test_validator_check_adapts_raising_validator():
+    class Even(Validator):
+        message = "Odd"
+
+        def __call__(self, value):
+            if value % 2:
+                raise AvocatoValidationError(self.message)
+            return value
+
+    validator = Even()
+    assert validator.check(2) is None
+    assert validator.check(3).messages == ["Odd"]
+
+    with pytest.raises(NotImplementedError):
+        Validator().check(1)
+
+
+def test_one_of_indexes_hashable_choices():
+    validator = OneOf(["FR{0:04d}".format(i) for i in range(5000)])
+    assert validator._index is not None
+    assert validator.check("FR4999") is None
+    assert validator.check("DE0001") is not None
+    assert validator.check(["FR0001"]) is not None
+
+
+def test_one_of_searches_unhashable_choices_and_strings():
+    validator = OneOf([["a"], "b"])
+    assert validator._index is None
+    assert validator.check(["a"]) is None
+    assert validator.check("c") is not None
+
+    assert OneOf("abc").check("ab") is None
+
+
+def test_choices_text_is_rendered_lazily_and_capped():
+    validator = OneOf(range(100))
+    assert validator._choices_text is None
+
+    failure = validator.check(100)
+    assert failure.message == (
+        "Value 100 must be one of 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, "
+        "18, 19 and 80 more."
+    )
+    assert OneOfType((int, str)).choices_text == "<class 'int'>, <class 'str'>"
+
+
+@pytest.mark.parametrize(
+    "value,valid",
+    [
+        ("spongebob@bikini.bottom", True),
+        ("patrick.star+rock@bikini-bottom.sea", True),
+        ("\"sandy,cheeks\"@treedome.tx", True),
+        ("plankton@chum.bucket\n", True),
+        ("krabs@münchen.de", True),
+        ("squidward@[127.0.0.1]", True),
+        ("gary@.snail", False),
+        ("gary@snail", False),
+        ("@bikini.bottom", False),
+    ],
+)
+def test_email_fast_path_agrees_with_regexes(value, valid):
+    assert (Email().check(value) is None) is valid
+
+
+def test_email_cache_evicts_least_recently_used(mocker):
+    validator = Email(cache_size=2)
+    check = mocker.spy(validator, "_check")
+
+    assert validator.check("a@b.cd") is None
+    assert validator.check("nope") is not None
+    assert validator.check("a@b.cd") is None
+    assert check.call_count == 2
+
+    validator.check("c@d.ef")
+    assert list(validator._cache) == ["a@b.cd", "c@d.ef"]
+    assert validator.check("nope").message == "Not a valid email address."
+    assert check.call_count == 4
+
+
+def test_email_check_many_checks_repeated_addresses_once(mocker):
+    validator = Email()
+    check = mocker.spy(validator, "_check")
+
+    failures = validator.check_many(["a@b.cd", "nope", "a@b.cd", "nope"])
+    assert [failure is None for failure in failures] == [True, False, True, False]
+    assert check.call_count == 2
@@ -0,0 +1,79 @@
+import array
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from avocato.exceptions import AvocatoError
+from avocato.fields import DateTimeField, DecimalField, IntField, StrField
+from avocato.objects import AvocatoObject
+
+msgpack = pytest.importorskip("msgpack")
+msgpack_backend = pytest.importorskip("avocato.vendors.msgpack")
+
+
+class OrderObject(AvocatoObject):
+    id = IntField()
+    customer = StrField(required=False)
+    total = DecimalField()
+    created = DateTimeField()
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        Decimal("12.50"),
+        Decimal("-1E+3"),
+        datetime(2019, 1, 11, 12, 30, 15, 123456),
+        datetime(1901, 12, 31, 23, 59),
+        datetime(2019, 1, 11, 12, 30, tzinfo=timezone(timedelta(hours=-5, minutes=-30))),
+        2 ** 70,
+        -2 ** 64,
+        2 ** 64,
+    ],
+)
+def test_ext_types_round_trip(value):
+    packed = msgpack_backend.packb({"value": value})
+    assert msgpack.unpackb(packed, raw=False, ext_hook=msgpack_backend.ext_hook) == {
+        "value": value
+    }
+    unpacked = msgpack_backend.unpackb(packed)["value"]
+    assert type(unpacked) is type(value)
+    if isinstance(value, datetime):
+        assert unpacked.utcoffset() == value.utcoffset()
+
+
+def test_arrays_are_packed_as_lists():
+    packed = msgpack_backend.packb({"values": array.array("q", [1, 2])})
+    assert msgpack_backend.unpackb(packed) == {"values": [1, 2]}
+
+
+def test_unknown_values_are_not_packed():
+    with pytest.raises(TypeError):
+        msgpack_backend.packb({"value": object()})
+
+
+def test_object_to_msgpack_and_from_msgpack_round_trip():
+    data = {"id": 1, "total": Decimal("12.50"), "created": datetime(2019, 1, 11, 12, 30)}
+    obj = OrderObject(data)
+    assert obj.is_valid()
+
+    packed = obj.to_msgpack()
+    assert msgpack_backend.unpackb(packed) == dict(data, customer=None)
+
+    copy = OrderObject.from_msgpack(packed)
+    assert copy.is_valid()
+    assert copy.to_dict() == obj.to_dict()
+
+    big = OrderObject(dict(data, id=2 ** 70))
+    assert big.is_valid()
+    assert OrderObject.from_msgpack(big.to_msgpack()).id == 2 ** 70
+
+    batch = OrderObject([data, dict(data, id=2)], many=True)
+    assert batch.is_valid()
+    copies = OrderObject.from_msgpack(batch.to_msgpack(), many=True)
+    assert copies.is_valid()
+    assert copies.to_dict() == batch.to_dict()
+
+    with pytest.raises(AvocatoError):
+        OrderObject.from_msgpack(packed, many=True)
@@ -0,0 +1,215 @@
+import array
+from datetime import datetime, timezone
+
+import pytest
+
+from avocato import objects
+from avocato.exceptions import AvocatoError, render_messages
+from avocato.fields import BoolField, DateTimeField, FloatField, IntField, ListField, StrField
+from avocato.objects import AvocatoObject
+from avocato.validators import OneOf
+
+numpy = pytest.importorskip("numpy")
+numpy_backend = pytest.importorskip("avocato.vendors.numpy")
+
+
+class NumbersObject(AvocatoObject):
+    foo = IntField(validators=[OneOf([1, 2, 3, 1337])])
+    bar = FloatField(required=False)
+    baz = BoolField()
+    name = StrField(required=False)
+
+
+def make_rows():
+    rows = [{"foo": 1, "bar": 1.5, "baz": True} for _ in range(numpy_backend.MIN_ROWS)]
+    rows[3] = {"foo": 0, "bar": 0.0, "baz": True}
+    rows[10] = {"foo": 5, "baz": False}
+    rows[20] = {"foo": None, "baz": None}
+    rows[30] = {"foo": 1.0, "bar": "1.5", "baz": 1}
+    return rows
+
+
+@pytest.mark.parametrize(
+    "field,expected",
+    [
+        (IntField(), True),
+        (FloatField(validators=[OneOf([1.5])]), True),
+        (BoolField(required=False), True),
+        (StrField(), False),
+        (IntField(validators=[lambda value: value]), False),
+    ],
+)
+def test_supports(field, expected):
+    assert numpy_backend.supports(field) is expected
+
+
+def test_check_column_falls_back_for_mixed_types():
+    assert numpy_backend.check_column(IntField(), [1, 2.0, 3]) is None
+    assert numpy_backend.check_column(IntField(), ["1", "2"]) is None
+    assert numpy_backend.check_column(IntField(), [1, 2 ** 70]) is None
+
+
+def test_check_column_returns_failing_rows():
+    assert render_messages(numpy_backend.check_column(IntField(), [1, 0, 3, None])) == {
+        1: ["This field is required"],
+        3: ["This field is required"],
+    }
+    assert render_messages(numpy_backend.check_column(FloatField(), [1, 2])) == {
+        0: ["Value 1 of type <class 'int'> must be one of <class 'float'> type"],
+        1: ["Value 2 of type <class 'int'> must be one of <class 'float'> type"],
+    }
+
+
+def test_batch_errors_match_pure_python_path(monkeypatch):
+    rows = make_rows()
+    objs = NumbersObject(rows, many=True)
+    assert objs.is_valid() is False
+
+    monkeypatch.setattr(objects, "numpy_backend", None)
+    pure = NumbersObject(rows, many=True)
+    assert pure.is_valid() is False
+
+    assert objs.errors == pure.errors
+    assert list(objs.errors) == [3, 10, 20, 30]
+    assert objs.errors[10] == {
+        "foo": ["Value 5 must be one of 1, 2, 3, 1337."],
+        "baz": ["This field is required"],
+    }
+    assert objs.valid_data == pure.valid_data
+
+
+class SeriesObject(AvocatoObject):
+    readings = ListField(of=IntField(validators=[OneOf(range(100))]), storage="numpy")
+
+
+@pytest.mark.parametrize("storage", [None, "array", "numpy"])
+def test_list_column_errors_match_pure_python_path(storage, monkeypatch):
+    class Series(AvocatoObject):
+        readings = ListField(of=IntField(validators=[OneOf(range(100))]), storage=storage)
+
+    rows = [{"readings": list(range(50))} for _ in range(numpy_backend.MIN_ROWS)]
+    rows[1] = {"readings": [1, 200, 3]}
+    rows[2] = {"readings": []}
+    rows[3] = {"readings": "1, 2"}
+    rows[4] = {"readings": [1, "2"]}
+    objs = Series(rows, many=True)
+    assert objs.is_valid() is False
+
+    monkeypatch.setattr(objects, "numpy_backend", None)
+    pure = Series(rows, many=True)
+    assert pure.is_valid() is False
+
+    assert objs.errors == pure.errors
+    assert list(objs.errors) == [1, 2, 3, 4]
+    assert objs.errors[1] == {
+        "readings": {
+            1: [
+                "Value 200 must be one of 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, "
+                "16, 17, 18, 19 and 80 more."
+            ],
+        },
+    }
+
+
+def test_list_field_numpy_storage():
+    obj = SeriesObject({"readings": [1, 2, 3]})
+    assert isinstance(obj.readings, numpy.ndarray)
+    assert obj.readings.dtype == numpy.int64
+    assert obj.is_valid()
+    assert obj.to_dict(mode="json") == {"readings": [1, 2, 3]}
+
+    field = ListField(of=IntField(validators=[OneOf([1, 2, 3])]))
+    column = [numpy.array([1, 5]), array.array("q", [2, 3]), None, numpy.array([4])]
+    assert render_messages(numpy_backend.check_column(field, column)) == {
+        0: {1: ["Value 5 must be one of 1, 2, 3."]},
+        2: ["This field is required"],
+        3: {0: ["Value 4 must be one of 1, 2, 3."]},
+    }
+
+    # Elements are not cast, lists that don't fit are kept for validation to report.
+    assert SeriesObject({"readings": [1, 2.5]}).readings == [1, 2.5]
+    obj = SeriesObject({"readings": []})
+    assert obj.is_valid() is False
+    assert obj.errors == {"readings": ["This field is required"]}
+
+
+class RecordObject(AvocatoObject):
+    id = IntField()
+    score = FloatField(required=False)
+    active = BoolField()
+    code = StrField(max_length=4, label="Code", required=False)
+    created_at = DateTimeField()
+
+
+def test_to_array_builds_structured_array_of_valid_rows():
+    created_at = datetime(2019, 1, 11, 12, 30)
+    objs = RecordObject(
+        [
+            {"id": 1, "score": 1.5, "active": True, "code": "ab", "created_at": created_at},
+            {"id": "2", "active": True, "code": "x", "created_at": created_at},
+            {"id": 3, "active": True, "code": "cdef", "created_at": created_at},
+        ],
+        many=True,
+    )
+    assert objs.is_valid() is False
+
+    array = objs.to_array()
+    assert array.dtype == numpy.dtype(
+        [
+            ("id", numpy.int64),
+            ("score", numpy.float64),
+            ("active", numpy.bool_),
+            ("Code", "U4"),
+            ("created_at", "datetime64[us]"),
+        ]
+    )
+    assert array["id"].tolist() == [1, 3]
+    assert array["score"][0] == 1.5
+    assert numpy.isnan(array["score"][1])
+    assert array["Code"].tolist() == ["ab", "cdef"]
+    assert array["created_at"].tolist() == [created_at, created_at]
+
+
+def test_to_structured_array_stores_missing_strings_as_empty():
+    field = StrField(max_length=3)
+    field.name = "foo"
+    array = numpy_backend.to_structured_array([field], [["abc", None]])
+    assert array["foo"].tolist() == ["abc", ""]
+
+
+def test_to_array_raises_for_unsupported_fields():
+    class FooObj(AvocatoObject):
+        foo = StrField()
+
+    objs = FooObj([{"foo": "bar"}], many=True)
+    assert objs.is_valid()
+    with pytest.raises(AvocatoError):
+        objs.to_array()
+
+
+def test_to_array_raises_for_missing_integers():
+    class FooObj(AvocatoObject):
+        foo = IntField(required=False)
+
+    objs = FooObj([{"foo": 1}, {}], many=True)
+    assert objs.is_valid()
+    with pytest.raises(AvocatoError):
+        objs.to_array()
+
+
+def test_to_structured_array_rejects_aware_datetimes():
+    field = DateTimeField(required=False)
+    field.name = "created_at"
+    naive = datetime(2019, 1, 11, 12, 30)
+    array = numpy_backend.to_structured_array([field], [[naive, None]])
+    assert array["created_at"][0].tolist() == naive
+    assert numpy.isnat(array["created_at"][1])
+
+    with pytest.raises(AvocatoError):
+        numpy_backend.to_structured_array([field], [[naive.replace(tzinfo=timezone.utc)]])
+
+
+def test_to_array_requires_many():
+    obj = RecordObject({"id": 1})
+    with pytest.raises(AvocatoError):
+        obj.to_array()